@@ -203,15 +203,17 @@ class Annotations:
                 )
                 current_id += 1
 
-            document = xml.etree.ElementTree.ElementTree(root)
             rels_file = f"{source}{RELS_FOLDER}/.rels"
-            with archive.open(rels_file, "w") as f:
-                document.write(
-                    f,
+            # Serialize the small part in one go and hand it to the archive with a single write
+            archive.writestr(
+                rels_file,
+                xml.etree.ElementTree.tostring(
+                    root,
                     xml_declaration=True,
                     encoding="UTF-8",
                     default_namespace=RELS_NAMESPACE,
-                )
+                ),
+            )
 
     def write_content_types(self, archive: zipfile.ZipFile) -> None:
         """Write ``[Content_Types].xml`` to the archive."""
@@ -264,14 +266,15 @@ class Annotations:
                         },
                     )
 
-        document = xml.etree.ElementTree.ElementTree(root)
-        with archive.open(CONTENT_TYPES_LOCATION, "w") as f:
-            document.write(
-                f,
+        archive.writestr(
+            CONTENT_TYPES_LOCATION,
+            xml.etree.ElementTree.tostring(
+                root,
                 xml_declaration=True,
                 encoding="UTF-8",
                 default_namespace=CONTENT_TYPES_NAMESPACE,
-            )
+            ),
+        )
 
     def store(self) -> None:
         """Serialize and store annotations in a Blender scene text block."""
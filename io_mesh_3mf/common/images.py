@@ -0,0 +1,56 @@
+# Blender add-on to import and export 3MF files.
+# Copyright (C) 2020 Ghostkeeper
+# Copyright (C) 2025 Jack (modernization for Blender 4.2+)
+# This add-on is free software; you can redistribute it and/or modify it under the terms of the GNU General Public
+# License as published by the Free Software Foundation; either version 2 of the License, or (at your option) any later
+# version.
+# This add-on is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this program; if not, write to the Free
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+"""
+Helpers for reading Blender image data without re-saving it.
+"""
+
+import os
+from typing import Optional, Tuple, Union
+
+import bpy
+
+__all__ = [
+    "PNG_SIGNATURE",
+    "JPEG_SIGNATURE",
+    "read_image_source",
+]
+
+# Leading bytes identifying each image file format.
+PNG_SIGNATURE = b"\x89PNG"
+JPEG_SIGNATURE = b"\xff\xd8\xff"
+
+
+def read_image_source(image: bpy.types.Image, signatures: Union[bytes, Tuple[bytes, ...]]) -> Optional[bytes]:
+    """
+    Return the original file contents of an unmodified file-backed image.
+
+    Reads the packed data or the file on disk directly, so callers can embed the image without
+    saving it through a temporary file.
+
+    :param image: The image to read.
+    :param signatures: File signature, or tuple of signatures, the contents must start with.
+    :return: The file contents, or None if the image is generated, modified, missing, or in
+        another format, and has to be saved instead.
+    """
+    if image.source != "FILE" or image.is_dirty:
+        return None
+    if image.packed_file is not None:
+        data = image.packed_file.data
+    else:
+        path = bpy.path.abspath(image.filepath, library=image.library)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+    if not data.startswith(signatures):
+        return None
+    return data
@@ -0,0 +1,50 @@
+# Blender add-on to import and export 3MF files.
+# Copyright (C) 2020 Ghostkeeper
+# Copyright (C) 2025 Jack (modernization for Blender 4.2+)
+# This add-on is free software; you can redistribute it and/or modify it under the terms of the GNU General Public
+# License as published by the Free Software Foundation; either version 2 of the License, or (at your option) any later
+# version.
+# This add-on is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this program; if not, write to the Free
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+"""
+Text encoding of MustPreserve files kept in Blender Text blocks.
+
+Preserved archive files are stored as Base64 behind a short marker, which the
+C-implemented ``base64`` codec handles quickly. Text blocks written by older
+versions hold unmarked Base85 and are still decoded.
+"""
+
+import base64
+
+__all__ = [
+    "PRESERVED_BASE64_MARKER",
+    "encode_preserved",
+    "decode_preserved",
+]
+
+PRESERVED_BASE64_MARKER: str = "base64:"
+"""Leading marker of Base64 contents. ``:`` is not in the Base85 alphabet, so it can't start legacy contents."""
+
+
+def encode_preserved(data: bytes) -> str:
+    """Encode a preserved file's bytes as text for a Blender Text block.
+
+    :param data: The file contents.
+    :return: Base64 text with the format marker prepended.
+    """
+    return PRESERVED_BASE64_MARKER + base64.b64encode(data).decode("ascii")
+
+
+def decode_preserved(contents: str) -> bytes:
+    """Decode the text of a preserved file back to its bytes.
+
+    :param contents: Text written by :func:`encode_preserved`, or legacy Base85 text.
+    :return: The file contents.
+    :raises ValueError: If unmarked contents are not valid Base85.
+    """
+    if contents.startswith(PRESERVED_BASE64_MARKER):
+        return base64.b64decode(contents[len(PRESERVED_BASE64_MARKER):])
+    return base64.b85decode(contents)
@@ -56,6 +56,9 @@ threemf_to_metre: Dict[str, float] = {
     "meter": 1,
 }
 
+# Exports always use the default 3MF unit (millimetres), so its size is resolved once.
+_EXPORT_UNIT_TO_METRE: float = threemf_to_metre[MODEL_DEFAULT_UNIT]
+
 
 def import_unit_scale(
     context: bpy.types.Context,
@@ -71,10 +74,10 @@ def import_unit_scale(
     """
     scale = global_scale
 
-    blender_unit_to_metre = context.scene.unit_settings.scale_length
+    unit_settings = context.scene.unit_settings
+    blender_unit_to_metre = unit_settings.scale_length
     if blender_unit_to_metre == 0:  # Fallback for special cases.
-        blender_unit = context.scene.unit_settings.length_unit
-        blender_unit_to_metre = blender_to_metre[blender_unit]
+        blender_unit_to_metre = blender_to_metre[unit_settings.length_unit]
 
     threemf_unit = root.attrib.get("unit", MODEL_DEFAULT_UNIT)
     threemf_unit_to_metre = threemf_to_metre[threemf_unit]
@@ -92,12 +95,10 @@ def export_unit_scale(context: bpy.types.Context, global_scale: float = 1.0) ->
     """
     scale = global_scale
 
-    blender_unit_to_metre = context.scene.unit_settings.scale_length
+    unit_settings = context.scene.unit_settings
+    blender_unit_to_metre = unit_settings.scale_length
     if blender_unit_to_metre == 0:
-        blender_unit = context.scene.unit_settings.length_unit
-        blender_unit_to_metre = blender_to_metre[blender_unit]
-
-    threemf_unit_to_metre = threemf_to_metre[MODEL_DEFAULT_UNIT]  # Always export as mm
+        blender_unit_to_metre = blender_to_metre[unit_settings.length_unit]
 
-    scale *= blender_unit_to_metre / threemf_unit_to_metre
+    scale *= blender_unit_to_metre / _EXPORT_UNIT_TO_METRE
     return scale
@@ -16,6 +16,7 @@ These are pure XML/transformation helpers that don't depend on Blender's scene
 state (though ``parse_transformation`` returns a ``mathutils.Matrix``).
 """
 
+import itertools
 import xml.etree.ElementTree
 from typing import Optional, Set
 
@@ -37,6 +38,9 @@ __all__ = [
     "read_metadata",
 ]
 
+# Bound formatter for transformation cells; same output as f"{cell:.9f}"
+_format_cell = "{:.9f}".format
+
 
 def parse_transformation(transformation_str: str) -> mathutils.Matrix:
     """Parse a 3MF affine transformation string into a 4×4 Matrix.
@@ -76,10 +80,8 @@ def format_transformation(transformation: mathutils.Matrix) -> str:
     :param transformation: The transformation matrix to format.
     :return: Space-separated string of 12 floats.
     """
-    import itertools
     pieces = (row[:3] for row in transformation.transposed())
-    formatted_cells = [f"{cell:.9f}" for cell in itertools.chain.from_iterable(pieces)]
-    return " ".join(formatted_cells)
+    return " ".join(map(_format_cell, itertools.chain.from_iterable(pieces)))
 
 
 def resolve_extension_prefixes(
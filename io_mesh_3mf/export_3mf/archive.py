@@ -17,19 +17,20 @@ Archive management for 3MF export.
 Functions for creating and managing the 3MF ZIP archive:
 - create_archive: Create an empty 3MF archive with OPC structure
 - must_preserve: Write must-preserve files from previous imports
+- compress_type_for: Pick stored or deflated compression for a file
 - write_core_properties: Write Dublin Core metadata
 """
 
-import base64
 import datetime
-import xml.etree.ElementTree
 import zipfile
+import zlib
 from typing import Optional, Callable
 
 import bpy
 
 from ..common.annotations import Annotations
 from ..common.logging import debug, error
+from ..common.preserved import decode_preserved
 from ..common.constants import (
     CORE_PROPERTIES_LOCATION,
     CORE_PROPERTIES_NAMESPACE,
@@ -38,6 +39,49 @@ from ..common.constants import (
     conflicting_mustpreserve_contents,
 )
 
+# The Core Properties part is a small fixed document; only the timestamps change per export.
+# Each namespace is declared exactly once on the root element.
+_CORE_PROPERTIES_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<cp:coreProperties xmlns:cp="{CORE_PROPERTIES_NAMESPACE}" xmlns:dc="{DC_NAMESPACE}" '
+    f'xmlns:dcterms="{DCTERMS_NAMESPACE}">'
+    "<dc:creator>Blender 3MF Format Add-on</dc:creator>"  # Who created this file
+    "<dcterms:created>{timestamp}</dcterms:created>"  # When the file was created (W3CDTF format)
+    "<dcterms:modified>{timestamp}</dcterms:modified>"  # When the file was last modified
+    "</cp:coreProperties>"
+)
+
+# Name prefix of the text blocks that hold must-preserve files from an imported 3MF.
+_PRESERVED_PREFIX = ".3mf_preserved/"
+_PRESERVED_PREFIX_LENGTH = len(_PRESERVED_PREFIX)
+
+# Leading bytes of formats that are already compressed (ZIP, PNG, JPEG, gzip, zstd).
+# Deflating these again costs CPU time for no size gain, so they are stored as-is.
+_COMPRESSED_SIGNATURES = (b"PK\x03\x04", b"\x89PNG", b"\xff\xd8\xff", b"\x1f\x8b", b"\x28\xb5\x2f\xfd")
+
+# Other data is probed by deflating a leading sample at the fastest level. If that
+# saves less than 5%, the data is treated as incompressible. Tiny files are not
+# worth probing; deflate's framing overhead alone would make them look incompressible.
+_ENTROPY_SAMPLE_SIZE = 4096
+_ENTROPY_MIN_SIZE = 512
+_INCOMPRESSIBLE_RATIO = 0.95
+
+
+def compress_type_for(data: bytes) -> int:
+    """
+    Pick the ZIP compression method for a file's contents.
+
+    :param data: The bytes that will be written to the archive.
+    :return: ``zipfile.ZIP_STORED`` for data that is already compressed or otherwise incompressible,
+        ``zipfile.ZIP_DEFLATED`` otherwise.
+    """
+    if data.startswith(_COMPRESSED_SIGNATURES):
+        return zipfile.ZIP_STORED
+    sample = data[:_ENTROPY_SAMPLE_SIZE]
+    if len(sample) >= _ENTROPY_MIN_SIZE and len(zlib.compress(sample, 1)) >= len(sample) * _INCOMPRESSIBLE_RATIO:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
 
 def create_archive(filepath: str, safe_report: Callable) -> Optional[zipfile.ZipFile]:
     """
@@ -78,18 +122,19 @@ def must_preserve(archive: zipfile.ZipFile) -> None:
 
     :param archive: The archive to write files to.
     """
-    for textfile in bpy.data.texts:
-        # Cache filename to protect Unicode characters from garbage collection
-        filename = str(textfile.name)
-        if not filename.startswith(".3mf_preserved/"):
-            continue  # Unrelated file. Not ours to read.
-        contents = textfile.as_string()
+    # keys() returns all text names as Python strings in one call, so unrelated texts are skipped
+    # without wrapping each one; most scenes have no preserved files at all.
+    texts = bpy.data.texts
+    preserved = [name for name in texts.keys() if name.startswith(_PRESERVED_PREFIX)]
+    if not preserved:
+        return
+    for filename in preserved:
+        contents = texts[filename].as_string()
         if contents == conflicting_mustpreserve_contents:
             continue  # This file was in conflict. Don't preserve any copy of it then.
-        contents = base64.b85decode(contents.encode("UTF-8"))
-        filename = filename[len(".3mf_preserved/"):]
-        with archive.open(filename, "w") as f:
-            f.write(contents)
+        contents = decode_preserved(contents)
+        filename = filename[_PRESERVED_PREFIX_LENGTH:]
+        archive.writestr(filename, contents, compress_type=compress_type_for(contents))
 
 
 def write_core_properties(archive: zipfile.ZipFile) -> None:
@@ -101,38 +146,12 @@ def write_core_properties(archive: zipfile.ZipFile) -> None:
 
     :param archive: The 3MF archive to write Core Properties into.
     """
-    # Register namespaces for cleaner output
-    xml.etree.ElementTree.register_namespace("cp", CORE_PROPERTIES_NAMESPACE)
-    xml.etree.ElementTree.register_namespace("dc", DC_NAMESPACE)
-    xml.etree.ElementTree.register_namespace("dcterms", DCTERMS_NAMESPACE)
-
-    # Create root element with proper namespaces
-    root = xml.etree.ElementTree.Element(
-        f"{{{CORE_PROPERTIES_NAMESPACE}}}coreProperties"
-    )
-    root.set("xmlns:dc", DC_NAMESPACE)
-    root.set("xmlns:dcterms", DCTERMS_NAMESPACE)
-
-    # dc:creator - who created this file
-    creator = xml.etree.ElementTree.SubElement(root, f"{{{DC_NAMESPACE}}}creator")
-    creator.text = "Blender 3MF Format Add-on"
-
-    # dcterms:created - when the file was created (W3CDTF format)
-    now = datetime.datetime.now(datetime.timezone.utc)
-    created = xml.etree.ElementTree.SubElement(root, f"{{{DCTERMS_NAMESPACE}}}created")
-    created.text = now.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    # dcterms:modified - when the file was last modified
-    modified = xml.etree.ElementTree.SubElement(
-        root, f"{{{DCTERMS_NAMESPACE}}}modified"
-    )
-    modified.text = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    contents = _CORE_PROPERTIES_TEMPLATE.format(timestamp=timestamp).encode("UTF-8")
 
     # Write the Core Properties file
-    document = xml.etree.ElementTree.ElementTree(root)
     try:
-        with archive.open(CORE_PROPERTIES_LOCATION, "w") as f:
-            document.write(f, xml_declaration=True, encoding="UTF-8")
+        archive.writestr(CORE_PROPERTIES_LOCATION, contents)
         debug("Wrote OPC Core Properties to docProps/core.xml")
     except Exception as e:
         error(f"Failed to write Core Properties: {e}")
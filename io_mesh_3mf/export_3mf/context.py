@@ -82,6 +82,7 @@ class ExportContext:
     vertex_colors: Dict[str, int] = field(default_factory=dict)
     material_name_to_index: Dict[str, int] = field(default_factory=dict)
     passthrough_id_remap: Dict[str, str] = field(default_factory=dict)
+    passthrough_data: Dict[str, dict] = field(default_factory=dict)  # Parsed scene passthrough blobs
 
     # --- Texture and PBR tracking -------------------------------------------
     texture_groups: Dict = field(default_factory=dict)
@@ -27,16 +27,30 @@ import xml.etree.ElementTree
 from typing import Optional, Dict, List
 
 import bpy
+import numpy as np
 
 from ..common.constants import MODEL_NAMESPACE
 from ..common.logging import debug, warn
 from ..common.metadata import Metadata
 from .materials import (
-    ORCA_FILAMENT_CODES,
+    ORCA_FILAMENT_CODE_MAP,
     get_triangle_color,
     get_or_create_tex2coord,
+    read_passthrough_data,
 )
 
+# Element and attribute names, built once. Slicer modes (PAINT/BASEMATERIAL) write plain
+# attribute names; standard mode qualifies them with the model namespace.
+_VERTICES = f"{{{MODEL_NAMESPACE}}}vertices"
+_VERTEX = f"{{{MODEL_NAMESPACE}}}vertex"
+_TRIANGLES = f"{{{MODEL_NAMESPACE}}}triangles"
+_TRIANGLE = f"{{{MODEL_NAMESPACE}}}triangle"
+_VERTEX_ATTRIBUTES = ("x", "y", "z")
+_VERTEX_ATTRIBUTES_NS = tuple(f"{{{MODEL_NAMESPACE}}}{name}" for name in _VERTEX_ATTRIBUTES)
+_TRIANGLE_ATTRIBUTES = ("v1", "v2", "v3", "p1", "p2", "p3", "pid")
+_TRIANGLE_ATTRIBUTES_NS = tuple(f"{{{MODEL_NAMESPACE}}}{name}" for name in _TRIANGLE_ATTRIBUTES)
+_MMU_SEGMENTATION = "{http://schemas.slic3r.org/3mf/2017/06}mmu_segmentation"
+
 
 def check_non_manifold_geometry(
     blender_objects: List[bpy.types.Object], use_mesh_modifiers: bool
@@ -45,8 +59,8 @@ def check_non_manifold_geometry(
     Check mesh objects for non-manifold geometry using BMesh.
 
     Non-manifold geometry can cause problems in slicers and is generally
-    not suitable for 3D printing. Uses BMesh's C-optimized is_manifold
-    property for fast detection.
+    not suitable for 3D printing. Edges are checked in bulk by counting the
+    faces that use each edge; vertices use BMesh's C-optimized is_manifold.
 
     Stops checking after finding the first non-manifold object for performance.
 
@@ -72,24 +86,23 @@ def check_non_manifold_geometry(
         if mesh is None:
             continue
 
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-
-        has_non_manifold = False
-
-        for edge in bm.edges:
-            if not edge.is_manifold:
-                has_non_manifold = True
-                break
-
-        if not has_non_manifold:
-            for vert in bm.verts:
-                if not vert.is_manifold:
-                    has_non_manifold = True
-                    break
-
-        bm.free()
-        eval_object.to_mesh_clear()
+        try:
+            # An edge is manifold when exactly two faces use it; count face uses per edge in bulk
+            loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("edge_index", loop_edges)
+            face_counts = np.bincount(loop_edges, minlength=len(mesh.edges))
+            has_non_manifold = bool((face_counts != 2).any())
+
+            if not has_non_manifold:
+                # Vertex manifoldness (disconnected face fans) still needs BMesh
+                bm = bmesh.new()
+                try:
+                    bm.from_mesh(mesh)
+                    has_non_manifold = not all(vert.is_manifold for vert in bm.verts)
+                finally:
+                    bm.free()
+        finally:
+            eval_object.to_mesh_clear()
 
         if has_non_manifold:
             return [blender_object.name]
@@ -99,43 +112,45 @@ def check_non_manifold_geometry(
 
 def write_vertices(
     mesh_element: xml.etree.ElementTree.Element,
-    vertices: List[bpy.types.MeshVertex],
+    vertices: bpy.types.MeshVertices,
     use_orca_format: str,
     coordinate_precision: int,
 ) -> None:
     """
     Writes a list of vertices into the specified mesh element.
 
+    Coordinates are read in bulk with ``foreach_get`` rather than per vertex.
+
     :param mesh_element: The <mesh> element of the 3MF document.
-    :param vertices: A list of Blender vertices to add.
+    :param vertices: The mesh's vertex collection (``mesh.vertices``).
     :param use_orca_format: Material export mode — affects namespace handling.
     :param coordinate_precision: Number of decimal places for coordinates.
     """
-    vertices_element = xml.etree.ElementTree.SubElement(
-        mesh_element, f"{{{MODEL_NAMESPACE}}}vertices"
-    )
+    vertices_element = xml.etree.ElementTree.SubElement(mesh_element, _VERTICES)
 
-    vertex_name = f"{{{MODEL_NAMESPACE}}}vertex"
     if use_orca_format in ("PAINT", "BASEMATERIAL"):
-        x_name = "x"
-        y_name = "y"
-        z_name = "z"
+        x_name, y_name, z_name = _VERTEX_ATTRIBUTES
     else:
-        x_name = f"{{{MODEL_NAMESPACE}}}x"
-        y_name = f"{{{MODEL_NAMESPACE}}}y"
-        z_name = f"{{{MODEL_NAMESPACE}}}z"
+        x_name, y_name, z_name = _VERTEX_ATTRIBUTES_NS
+
+    coordinates = np.empty(len(vertices) * 3, dtype=np.float32)
+    vertices.foreach_get("co", coordinates)
+
+    # Format every coordinate in one pass; same output as formatting vertex.co per vertex
+    format_coordinate = f"{{:.{coordinate_precision}}}".format
+    formatted = list(map(format_coordinate, coordinates.tolist()))
 
-    decimals = coordinate_precision
-    for vertex in vertices:
-        vertex_element = xml.etree.ElementTree.SubElement(vertices_element, vertex_name)
-        vertex_element.attrib[x_name] = f"{vertex.co[0]:.{decimals}}"
-        vertex_element.attrib[y_name] = f"{vertex.co[1]:.{decimals}}"
-        vertex_element.attrib[z_name] = f"{vertex.co[2]:.{decimals}}"
+    for i in range(0, len(formatted), 3):
+        xml.etree.ElementTree.SubElement(
+            vertices_element,
+            _VERTEX,
+            attrib={x_name: formatted[i], y_name: formatted[i + 1], z_name: formatted[i + 2]},
+        )
 
 
 def write_triangles(
     mesh_element: xml.etree.ElementTree.Element,
-    triangles: List[bpy.types.MeshLoopTriangle],
+    triangles: bpy.types.MeshLoopTriangles,
     object_material_list_index: int,
     material_slots: List[bpy.types.MaterialSlot],
     material_name_to_index: Dict[str, int],
@@ -152,7 +167,7 @@ def write_triangles(
     Writes a list of triangles into the specified mesh element.
 
     :param mesh_element: The <mesh> element of the 3MF document.
-    :param triangles: A list of triangles.
+    :param triangles: The mesh's triangle collection (``mesh.loop_triangles``).
     :param object_material_list_index: The index of the material that the object was written with.
     :param material_slots: List of materials belonging to the object.
     :param material_name_to_index: Mapping from material name to index.
@@ -165,32 +180,18 @@ def write_triangles(
     :param basematerials_resource_id: The ID of the basematerials resource for per-face material refs.
     :param segmentation_strings: Dict of face_index -> segmentation hash string (for PAINT mode).
     """
+    # Arguments are passed unformatted; debug() only stringifies them when DEBUG_MODE is on
     debug(
-        f"[write_triangles] mode={use_orca_format}, slicer={mmu_slicer_format},",
-        f" seg_strings={len(segmentation_strings) if segmentation_strings else 0}"
+        "[write_triangles] mode:", use_orca_format, "slicer:", mmu_slicer_format,
+        "seg_strings:", len(segmentation_strings) if segmentation_strings else 0,
     )
 
-    triangles_element = xml.etree.ElementTree.SubElement(
-        mesh_element, f"{{{MODEL_NAMESPACE}}}triangles"
-    )
+    triangles_element = xml.etree.ElementTree.SubElement(mesh_element, _TRIANGLES)
 
-    triangle_name = f"{{{MODEL_NAMESPACE}}}triangle"
     if use_orca_format in ("PAINT", "BASEMATERIAL"):
-        v1_name = "v1"
-        v2_name = "v2"
-        v3_name = "v3"
-        p1_name = "p1"
-        p2_name = "p2"
-        p3_name = "p3"
-        pid_name = "pid"
+        v1_name, v2_name, v3_name, p1_name, p2_name, p3_name, pid_name = _TRIANGLE_ATTRIBUTES
     else:
-        v1_name = f"{{{MODEL_NAMESPACE}}}v1"
-        v2_name = f"{{{MODEL_NAMESPACE}}}v2"
-        v3_name = f"{{{MODEL_NAMESPACE}}}v3"
-        p1_name = f"{{{MODEL_NAMESPACE}}}p1"
-        p2_name = f"{{{MODEL_NAMESPACE}}}p2"
-        p3_name = f"{{{MODEL_NAMESPACE}}}p3"
-        pid_name = f"{{{MODEL_NAMESPACE}}}pid"
+        v1_name, v2_name, v3_name, p1_name, p2_name, p3_name, pid_name = _TRIANGLE_ATTRIBUTES_NS
 
     # Get active UV layer for texture coordinate export
     uv_layer = None
@@ -199,57 +200,84 @@ def write_triangles(
 
     seg_strings_written = 0
 
-    for tri_idx, triangle in enumerate(triangles):
-        triangle_element = xml.etree.ElementTree.SubElement(
-            triangles_element, triangle_name
+    if basematerials_resource_id:
+        basematerials_resource_id = str(basematerials_resource_id)
+
+    # Read all per-triangle data in bulk instead of crossing into RNA for every attribute
+    num_triangles = len(triangles)
+    triangle_vertices = np.empty(num_triangles * 3, dtype=np.int32)
+    triangle_materials = np.empty(num_triangles, dtype=np.int32)
+    triangles.foreach_get("vertices", triangle_vertices)
+    triangles.foreach_get("material_index", triangle_materials)
+    triangle_vertices = triangle_vertices.tolist()
+    triangle_materials = triangle_materials.tolist()
+
+    triangle_loops = None
+    uv_coordinates = None
+    loop_uv_ids = None
+    if uv_layer:
+        triangle_loops = np.empty(num_triangles * 3, dtype=np.int32)
+        triangles.foreach_get("loops", triangle_loops)
+        triangle_loops = triangle_loops.tolist()
+        uv_pairs = np.empty((len(uv_layer.data), 2), dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uv_pairs.ravel())
+        uv_coordinates = uv_pairs.ravel().tolist()
+        # Number each distinct UV pair (compared bit-for-bit), so loops sharing a UV share an ID
+        loop_uv_ids = np.unique(uv_pairs.view(np.int64).ravel(), return_inverse=True)[1].tolist()
+
+    # Bind everything the loop reads to locals and resolve per-slot material names once
+    sub_element = xml.etree.ElementTree.SubElement
+    is_prusa = mmu_slicer_format == "PRUSA"
+    use_color_zones = bool(use_orca_format == "BASEMATERIAL" and vertex_colors and mesh and blender_object)
+    filament_codes = ORCA_FILAMENT_CODE_MAP
+    slot_material_names = [
+        str(slot.material.name) if slot.material is not None else None for slot in material_slots
+    ]
+    num_slots = len(slot_material_names)
+    triangle_colors: Dict[int, Optional[str]] = {}
+    tex2coord_indices: Dict[str, Dict[int, str]] = {}  # Material name -> UV ID -> tex2coord index
+
+    for tri_idx in range(num_triangles):
+        base = tri_idx * 3
+        v1, v2, v3 = triangle_vertices[base:base + 3]
+        triangle_element = sub_element(
+            triangles_element, _TRIANGLE, attrib={v1_name: str(v1), v2_name: str(v2), v3_name: str(v3)}
         )
-        triangle_element.attrib[v1_name] = str(triangle.vertices[0])
-        triangle_element.attrib[v2_name] = str(triangle.vertices[1])
-        triangle_element.attrib[v3_name] = str(triangle.vertices[2])
 
         # Handle segmentation strings from UV texture (PAINT mode)
         if segmentation_strings and tri_idx in segmentation_strings:
             seg_string = segmentation_strings[tri_idx]
             if seg_string:
-                if mmu_slicer_format == "PRUSA":
-                    ns_attr = "{http://schemas.slic3r.org/3mf/2017/06}mmu_segmentation"
-                    triangle_element.attrib[ns_attr] = seg_string
-                    seg_strings_written += 1
+                if is_prusa:
+                    triangle_element.attrib[_MMU_SEGMENTATION] = seg_string
                 else:
                     triangle_element.attrib["paint_color"] = seg_string
-                    seg_strings_written += 1
+                seg_strings_written += 1
                 continue
 
         # Handle multi-material color zones (BASEMATERIAL mode only)
-        if (
-            use_orca_format == "BASEMATERIAL"
-            and vertex_colors
-            and mesh
-            and blender_object
-        ):
-            triangle_color = get_triangle_color(mesh, triangle, blender_object)
+        if use_color_zones:
+            # The color only depends on the face's material slot, so resolve it once per slot
+            material_index = triangle_materials[tri_idx]
+            if material_index in triangle_colors:
+                triangle_color = triangle_colors[material_index]
+            else:
+                triangle_color = get_triangle_color(mesh, triangles[tri_idx], blender_object)
+                triangle_colors[material_index] = triangle_color
             if triangle_color and triangle_color in vertex_colors:
                 colorgroup_id = vertex_colors[triangle_color]
+                paint_code = filament_codes.get(colorgroup_id)
 
-                if mmu_slicer_format == "PRUSA":
-                    if colorgroup_id < len(ORCA_FILAMENT_CODES):
-                        paint_code = ORCA_FILAMENT_CODES[colorgroup_id]
-                        if paint_code:
-                            ns_attr = "{http://schemas.slic3r.org/3mf/2017/06}mmu_segmentation"
-                            triangle_element.attrib[ns_attr] = paint_code
+                if is_prusa:
+                    if paint_code is not None:
+                        triangle_element.attrib[_MMU_SEGMENTATION] = paint_code
                 else:
-                    triangle_element.attrib[pid_name] = str(colorgroup_id)
-                    triangle_element.attrib[p1_name] = "0"
-
-                    if colorgroup_id < len(ORCA_FILAMENT_CODES):
-                        paint_code = ORCA_FILAMENT_CODES[colorgroup_id]
-                        if paint_code:
-                            triangle_element.attrib["paint_color"] = paint_code
-        elif triangle.material_index < len(material_slots):
-            triangle_material = material_slots[triangle.material_index].material
-            if triangle_material is not None:
-                triangle_material_name = str(triangle_material.name)
-
+                    triangle_element.attrib.update({pid_name: str(colorgroup_id), p1_name: "0"})
+                    if paint_code is not None:
+                        triangle_element.attrib["paint_color"] = paint_code
+        elif triangle_materials[tri_idx] < num_slots:
+            triangle_material_name = slot_material_names[triangle_materials[tri_idx]]
+            if triangle_material_name is not None:
                 # Textured material — use texture2dgroup with UV indices
                 if (
                     texture_groups
@@ -260,34 +288,33 @@ def write_triangles(
                     group_id = group_data["group_id"]
                     triangle_element.attrib[pid_name] = group_id
 
-                    uv_data = uv_layer.data
-                    loop_indices = triangle.loops
-
-                    uv1 = uv_data[loop_indices[0]].uv
-                    uv2 = uv_data[loop_indices[1]].uv
-                    uv3 = uv_data[loop_indices[2]].uv
-
-                    idx1 = get_or_create_tex2coord(group_data, uv1[0], uv1[1])
-                    idx2 = get_or_create_tex2coord(group_data, uv2[0], uv2[1])
-                    idx3 = get_or_create_tex2coord(group_data, uv3[0], uv3[1])
-
-                    triangle_element.attrib[p1_name] = str(idx1)
-                    triangle_element.attrib[p2_name] = str(idx2)
-                    triangle_element.attrib[p3_name] = str(idx3)
+                    # Only the first loop with a given UV goes through get_or_create_tex2coord;
+                    # calls are still made in triangle order, so tex2coord numbering is unchanged
+                    known_indices = tex2coord_indices.setdefault(triangle_material_name, {})
+                    tex2coord_strings = []
+                    for loop in triangle_loops[base:base + 3]:
+                        uv_id = loop_uv_ids[loop]
+                        tex2coord_string = known_indices.get(uv_id)
+                        if tex2coord_string is None:
+                            tex2coord_string = str(get_or_create_tex2coord(
+                                group_data, uv_coordinates[loop * 2], uv_coordinates[loop * 2 + 1]
+                            ))
+                            known_indices[uv_id] = tex2coord_string
+                        tex2coord_strings.append(tex2coord_string)
+
+                    triangle_element.attrib.update(zip((p1_name, p2_name, p3_name), tex2coord_strings))
 
                 elif triangle_material_name in material_name_to_index:
                     material_index = material_name_to_index[triangle_material_name]
                     if material_index != object_material_list_index:
                         if basematerials_resource_id:
-                            triangle_element.attrib[pid_name] = str(
-                                basematerials_resource_id
-                            )
+                            triangle_element.attrib[pid_name] = basematerials_resource_id
                         triangle_element.attrib[p1_name] = str(material_index)
 
     if segmentation_strings:
         debug(
-            f"  [write_triangles] Wrote {seg_strings_written} segmentation strings",
-            f"to triangles (had {len(segmentation_strings)} available)"
+            "  [write_triangles] Wrote", seg_strings_written, "segmentation strings",
+            "to triangles (had", len(segmentation_strings), "available)",
         )
 
 
@@ -298,6 +325,7 @@ def write_passthrough_triangles(
     remapped_pid: str,
     use_orca_format: str,
     coordinate_precision: int,
+    passthrough_data: Optional[Dict[str, dict]] = None,
 ) -> None:
     """
     Write triangles with passthrough multiproperties indices from UV map.
@@ -312,24 +340,19 @@ def write_passthrough_triangles(
     :param remapped_pid: The remapped multiproperties resource ID.
     :param use_orca_format: Material export mode.
     :param coordinate_precision: Number of decimal places for coordinates.
+    :param passthrough_data: Parsed passthrough data from read_passthrough_data().
+                             Read from the scene when not given.
     """
-    import json
-
-    scene = bpy.context.scene
+    if passthrough_data is None:
+        passthrough_data = read_passthrough_data()
 
     uv_layer = mesh.uv_layers.active
     if not uv_layer:
         warn("No active UV layer found for passthrough triangle export")
         return
 
-    # Load multiproperties data to get the multi entries
-    mp_data_str = scene.get("3mf_multiproperties", "{}")
-    try:
-        mp_data = json.loads(mp_data_str)
-    except json.JSONDecodeError:
-        warn("Failed to parse multiproperties for passthrough triangle export")
-        return
-
+    # Multiproperties data holds the multi entries
+    mp_data = passthrough_data.get("3mf_multiproperties", {})
     multiprop = mp_data.get(original_pid)
     if not multiprop:
         warn(f"Multiproperties {original_pid} not found in passthrough data")
@@ -341,13 +364,8 @@ def write_passthrough_triangles(
         warn("Multiproperties has no pids")
         return
 
-    # Load texture group data to get tex2coords
-    tg_data_str = scene.get("3mf_texture_groups", "{}")
-    try:
-        tg_data = json.loads(tg_data_str)
-    except json.JSONDecodeError:
-        warn("Failed to parse texture groups for passthrough triangle export")
-        return
+    # Texture group data holds the tex2coords
+    tg_data = passthrough_data.get("3mf_texture_groups", {})
 
     # Find the first texture group pid (skip basematerials pid)
     tex2coords = None
@@ -393,37 +411,21 @@ def write_passthrough_triangles(
                     best_idx = idx
         return best_idx
 
-    triangles_element = xml.etree.ElementTree.SubElement(
-        mesh_element, f"{{{MODEL_NAMESPACE}}}triangles"
-    )
+    triangles_element = xml.etree.ElementTree.SubElement(mesh_element, _TRIANGLES)
 
-    triangle_name = f"{{{MODEL_NAMESPACE}}}triangle"
     if use_orca_format in ("PAINT", "BASEMATERIAL"):
-        v1_name = "v1"
-        v2_name = "v2"
-        v3_name = "v3"
-        p1_name = "p1"
-        p2_name = "p2"
-        p3_name = "p3"
+        v1_name, v2_name, v3_name, p1_name, p2_name, p3_name, pid_name = _TRIANGLE_ATTRIBUTES
     else:
-        v1_name = f"{{{MODEL_NAMESPACE}}}v1"
-        v2_name = f"{{{MODEL_NAMESPACE}}}v2"
-        v3_name = f"{{{MODEL_NAMESPACE}}}v3"
-        p1_name = f"{{{MODEL_NAMESPACE}}}p1"
-        p2_name = f"{{{MODEL_NAMESPACE}}}p2"
-        p3_name = f"{{{MODEL_NAMESPACE}}}p3"
+        v1_name, v2_name, v3_name, p1_name, p2_name, p3_name, pid_name = _TRIANGLE_ATTRIBUTES_NS
 
     for triangle in mesh.loop_triangles:
-        tri_elem = xml.etree.ElementTree.SubElement(triangles_element, triangle_name)
+        tri_elem = xml.etree.ElementTree.SubElement(triangles_element, _TRIANGLE)
         tri_elem.attrib[v1_name] = str(triangle.vertices[0])
         tri_elem.attrib[v2_name] = str(triangle.vertices[1])
         tri_elem.attrib[v3_name] = str(triangle.vertices[2])
 
         # Set pid to multiproperties ID on each triangle
-        if use_orca_format in ("PAINT", "BASEMATERIAL"):
-            tri_elem.attrib["pid"] = str(remapped_pid)
-        else:
-            tri_elem.attrib[f"{{{MODEL_NAMESPACE}}}pid"] = str(remapped_pid)
+        tri_elem.attrib[pid_name] = str(remapped_pid)
 
         # Map UV coordinates to multi entry indices
         loop_indices = triangle.loops
@@ -446,10 +448,7 @@ def write_passthrough_triangles(
         tri_elem.attrib[p2_name] = str(multi_idx2)
         tri_elem.attrib[p3_name] = str(multi_idx3)
 
-    debug(
-        f"Wrote {len(mesh.loop_triangles)} passthrough triangles "
-        f"with multiproperties UV indices"
-    )
+    debug("Wrote", len(mesh.loop_triangles), "passthrough triangles with multiproperties UV indices")
 
 
 def write_metadata(
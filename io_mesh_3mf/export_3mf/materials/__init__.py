@@ -23,8 +23,13 @@ This package handles export of:
 
 from .base import (
     ORCA_FILAMENT_CODES,
+    ORCA_FILAMENT_CODE_MAP,
+    PrincipledValues,
+    read_principled_values,
     material_to_hex_color,
     get_triangle_color,
+    get_slot_colors,
+    count_triangle_colors,
     collect_face_colors,
     write_materials,
     write_prusa_filament_colors,
@@ -47,6 +52,8 @@ from .textures import (
 )
 
 from .passthrough import (
+    has_passthrough_materials,
+    read_passthrough_data,
     write_passthrough_materials,
     write_passthrough_textures_to_archive,
 )
@@ -54,8 +61,13 @@ from .passthrough import (
 __all__ = [
     # Base materials
     "ORCA_FILAMENT_CODES",
+    "ORCA_FILAMENT_CODE_MAP",
+    "PrincipledValues",
+    "read_principled_values",
     "material_to_hex_color",
     "get_triangle_color",
+    "get_slot_colors",
+    "count_triangle_colors",
     "collect_face_colors",
     "write_materials",
     "write_prusa_filament_colors",
@@ -72,6 +84,8 @@ __all__ = [
     "write_pbr_textures_to_archive",
     "write_pbr_texture_display_properties",
     # Passthrough
+    "has_passthrough_materials",
+    "read_passthrough_data",
     "write_passthrough_materials",
     "write_passthrough_textures_to_archive",
 ]
@@ -22,10 +22,11 @@ Handles:
 """
 
 import xml.etree.ElementTree
-from typing import Optional, Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Union
 
 import bpy
-import bpy_extras.node_shader_utils
+import numpy as np
 
 from ...common.constants import (
     MODEL_NAMESPACE,
@@ -35,6 +36,15 @@ from ...common import debug, warn
 from ...common.colors import linear_to_srgb
 from ..components import collect_mesh_objects
 
+# Qualified element and attribute names, built once rather than per written material.
+_BASE = f"{{{MODEL_NAMESPACE}}}base"
+_BASEMATERIALS = f"{{{MODEL_NAMESPACE}}}basematerials"
+_COLOR = f"{{{MATERIAL_NAMESPACE}}}color"
+_COLORGROUP = f"{{{MATERIAL_NAMESPACE}}}colorgroup"
+_DISPLAYCOLOR = f"{{{MODEL_NAMESPACE}}}displaycolor"
+_ID = f"{{{MODEL_NAMESPACE}}}id"
+_NAME = f"{{{MODEL_NAMESPACE}}}name"
+
 # Orca Slicer paint_color encoding for filament IDs
 # This matches CONST_FILAMENTS in OrcaSlicer's Model.cpp
 # Index 0 = no color (base extruder), 1-32 = filament IDs
@@ -74,6 +84,122 @@ ORCA_FILAMENT_CODES = [
     "EFC",
 ]
 
+# Filament index -> paint code, for the indices that have one (index 0 has none)
+ORCA_FILAMENT_CODE_MAP = {index: code for index, code in enumerate(ORCA_FILAMENT_CODES) if code}
+
+
+@dataclass
+class PrincipledValues:
+    """
+    Input values of a material's Principled BSDF, read in one pass over its node tree.
+
+    Materials without a Principled BSDF node fall back to the material's viewport settings, the
+    same values ``PrincipledBSDFWrapper`` reports for them.
+
+    Attributes:
+        base_color: Linear RGB base color
+        alpha: Alpha input
+        metallic: Metallic input
+        roughness: Roughness input
+        specular_ior_level: Specular IOR Level input
+        ior: IOR input
+        transmission: Transmission Weight (or legacy Transmission) input
+        specular_tint: Specular Tint input, an RGB tuple in Blender 4.x or a float in older
+            versions; None when the node has no such input
+    """
+
+    base_color: Tuple[float, float, float]
+    alpha: float = 1.0
+    metallic: float = 0.0
+    roughness: float = 0.5
+    specular_ior_level: float = 0.5
+    ior: float = 1.0
+    transmission: float = 0.0
+    specular_tint: Optional[Union[Tuple[float, float, float], float]] = None
+
+
+def read_principled_values(material: bpy.types.Material) -> PrincipledValues:
+    """
+    Read the Principled BSDF inputs of a material.
+
+    Like ``PrincipledBSDFWrapper``, this uses the Principled BSDF node linked to the Surface input
+    of the material output, and reads its input sockets directly instead of walking the node tree
+    again for the inputs the wrapper does not expose. See ``find_principled_node`` for how the
+    node is chosen.
+
+    :param material: The Blender material to read.
+    :return: The material's Principled BSDF input values.
+    """
+    principled = None
+    if material.use_nodes and material.node_tree:
+        principled = find_principled_node(material.node_tree)
+
+    if principled is None:
+        return PrincipledValues(
+            base_color=tuple(material.diffuse_color[:3]),
+            metallic=material.metallic,
+            roughness=material.roughness,
+            specular_ior_level=material.specular_intensity,
+        )
+
+    inputs = principled.inputs
+    values = PrincipledValues(
+        base_color=tuple(inputs["Base Color"].default_value[:3]),
+        alpha=inputs["Alpha"].default_value,
+        metallic=inputs["Metallic"].default_value,
+        roughness=inputs["Roughness"].default_value,
+        specular_ior_level=inputs["Specular IOR Level"].default_value,
+        ior=inputs["IOR"].default_value,
+    )
+
+    # Blender 4.0+ uses 'Transmission Weight' instead of 'Transmission'
+    transmission_input = inputs.get("Transmission Weight")
+    if transmission_input is None:
+        transmission_input = inputs.get("Transmission")
+    if transmission_input is not None:
+        values.transmission = transmission_input.default_value
+
+    tint_input = inputs.get("Specular Tint")
+    if tint_input is not None:
+        tint = tint_input.default_value
+        # Blender 4.x: an RGBA color. Older versions: a float 0-1.
+        values.specular_tint = tuple(tint[:3]) if hasattr(tint, "__iter__") else float(tint)
+
+    return values
+
+
+def find_principled_node(node_tree: bpy.types.NodeTree) -> Optional[bpy.types.Node]:
+    """
+    Find the Principled BSDF node that shades a material.
+
+    Uses the node linked to the Surface input of the active material output, so leftover or
+    disconnected Principled nodes are ignored. When that input is linked to any other shader (a
+    Mix Shader, for example), there is no Principled node to read, matching
+    ``PrincipledBSDFWrapper``; the material then exports its viewport settings.
+
+    Unlike the wrapper, a tree whose output has nothing linked to its Surface input, or that has no
+    material output at all, falls back to its first Principled node.
+
+    :param node_tree: The material's node tree.
+    :return: The Principled BSDF node, or None if there is none to read.
+    """
+    first_principled = None
+    output = None
+    for node in node_tree.nodes:
+        if node.type == "BSDF_PRINCIPLED":
+            if first_principled is None:
+                first_principled = node
+        elif node.type == "OUTPUT_MATERIAL" and (output is None or node.is_active_output):
+            output = node
+
+    if output is not None:
+        surface = output.inputs.get("Surface")
+        if surface is not None and surface.is_linked:
+            linked_node = surface.links[0].from_node
+            return linked_node if linked_node.type == "BSDF_PRINCIPLED" else None
+
+    return first_principled
+
 
 def material_to_hex_color(material: bpy.types.Material) -> Optional[str]:
     """
@@ -89,28 +215,30 @@ def material_to_hex_color(material: bpy.types.Material) -> Optional[str]:
     if material is None:
         return None
 
-    color = None
+    # Try Principled BSDF first; materials without one already report their diffuse_color
+    color = read_principled_values(material).base_color
 
-    # Try Principled BSDF first for materials with node setup
-    if material.use_nodes and material.node_tree:
-        principled = bpy_extras.node_shader_utils.PrincipledBSDFWrapper(material, is_readonly=True)
-        base_color = principled.base_color
-        # Check if it's not the default gray (0.8, 0.8, 0.8)
-        if base_color and not (
-            abs(base_color[0] - 0.8) < 0.01 and abs(base_color[1] - 0.8) < 0.01 and abs(base_color[2] - 0.8) < 0.01
-        ):
-            color = base_color
-
-    # Fall back to diffuse_color for simple materials
-    if color is None:
+    # Fall back to diffuse_color when the Principled BSDF is left at its default gray (0.8, 0.8, 0.8)
+    if abs(color[0] - 0.8) < 0.01 and abs(color[1] - 0.8) < 0.01 and abs(color[2] - 0.8) < 0.01:
         color = material.diffuse_color[:3]
 
-    # Blender stores colors in linear space; 3MF hex colors are sRGB.
-    # Convert linear -> sRGB before encoding.
-    red = min(255, max(0, round(linear_to_srgb(color[0]) * 255)))
-    green = min(255, max(0, round(linear_to_srgb(color[1]) * 255)))
-    blue = min(255, max(0, round(linear_to_srgb(color[2]) * 255)))
-    return "#%0.2X%0.2X%0.2X" % (red, green, blue)
+    return "#" + bytes(_srgb_bytes(color)).hex().upper()
+
+
+def _srgb_bytes(color) -> Tuple[int, int, int]:
+    """
+    Convert a linear RGB color to sRGB channel values in 0-255.
+
+    Blender stores colors in linear space; 3MF hex colors are sRGB.
+
+    :param color: Linear color; only the first three components are used.
+    :return: The red, green and blue sRGB bytes.
+    """
+    return (
+        min(255, max(0, round(linear_to_srgb(color[0]) * 255))),
+        min(255, max(0, round(linear_to_srgb(color[1]) * 255))),
+        min(255, max(0, round(linear_to_srgb(color[2]) * 255))),
+    )
 
 
 def get_triangle_color(
@@ -130,12 +258,66 @@ def get_triangle_color(
     :return: Hex color string like "#RRGGBB" or None if no color.
     """
     slot_source = eval_object if eval_object is not None else blender_object
-    if triangle.material_index < len(slot_source.material_slots):
-        material = slot_source.material_slots[triangle.material_index].material
-        return material_to_hex_color(material)
+    material_slots = slot_source.material_slots
+    material_index = triangle.material_index
+    if material_index < len(material_slots):
+        return material_to_hex_color(material_slots[material_index].material)
     return None
 
 
+def get_slot_colors(
+    blender_object: bpy.types.Object,
+    eval_object: bpy.types.Object = None,
+) -> List[Optional[str]]:
+    """
+    Get the color of every material slot of an object, indexed by material index.
+
+    A triangle's color only depends on its face's material slot, so code coloring many triangles
+    resolves each slot once with this rather than calling :func:`get_triangle_color` per triangle.
+
+    :param blender_object: The object whose material slots to read.
+    :param eval_object: The evaluated object (for Geometry Nodes material slots).
+        Falls back to *blender_object* when not provided.
+    :return: Hex color string like "#RRGGBB" per slot, or None for empty slots.
+    """
+    slot_source = eval_object if eval_object is not None else blender_object
+    return [material_to_hex_color(slot.material) for slot in slot_source.material_slots]
+
+
+def count_triangle_colors(
+    mesh: bpy.types.Mesh,
+    blender_object: bpy.types.Object,
+    vertex_colors: Dict[str, int],
+) -> Dict[str, int]:
+    """
+    Count the triangles of a mesh per face color, for colors that have a color zone.
+
+    Triangles are counted per material index in one pass, and each material slot's color is
+    resolved once. Colors appear in the order of their first triangle, as a scan over the
+    triangles would add them.
+
+    :param mesh: The mesh, with loop triangles calculated.
+    :param blender_object: The object the mesh belongs to.
+    :param vertex_colors: Dictionary of color hex to filament index.
+    :return: Dictionary mapping color hex strings to their triangle counts.
+    """
+    slot_colors = get_slot_colors(blender_object)
+    triangle_materials = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", triangle_materials)
+    material_indices, first_triangles, counts = np.unique(
+        triangle_materials, return_index=True, return_counts=True
+    )
+
+    color_counts = {}
+    for position in np.argsort(first_triangles).tolist():
+        material_index = int(material_indices[position])
+        if material_index < len(slot_colors):
+            color = slot_colors[material_index]
+            if color and color in vertex_colors:
+                color_counts[color] = color_counts.get(color, 0) + int(counts[position])
+    return color_counts
+
+
 def collect_face_colors(
     blender_objects: List[bpy.types.Object], use_mesh_modifiers: bool, safe_report
 ) -> Dict[str, int]:
@@ -152,6 +334,9 @@ def collect_face_colors(
     """
     unique_colors = set()
     objects_processed = 0
+    # Objects commonly share materials, so each material's color is resolved once per call,
+    # keyed by its pointer (stable for the duration of the export, unlike the Python wrapper).
+    material_colors: Dict[int, Optional[str]] = {}
 
     # Recursively collect mesh objects (walks into nested empties)
     mesh_list = collect_mesh_objects(blender_objects, export_hidden=True)
@@ -168,34 +353,32 @@ def collect_face_colors(
         else:
             eval_object = blender_object
 
-        try:
-            mesh = eval_object.to_mesh()
-        except RuntimeError:
-            warn(f"Could not get mesh for object: {blender_object.name}")
-            continue
-
-        if mesh is None:
-            warn(f"Mesh is None for object: {blender_object.name}")
+        face_materials = _face_material_indices(blender_object, eval_object, use_mesh_modifiers)
+        if face_materials is None:
             continue
 
-        # Extract colors from face material assignments
-        debug(f"Object {blender_object.name}: {len(mesh.vertices)} vertices, {len(mesh.polygons)} faces")
-
         # Get all materials used by faces
         # Use the evaluated object's material slots when available, because
         # Geometry Nodes "Set Material" nodes only create slots on the
         # evaluated depsgraph copy.
         slot_source = eval_object if use_mesh_modifiers else blender_object
-        for face in mesh.polygons:
-            if face.material_index < len(slot_source.material_slots):
-                material = slot_source.material_slots[face.material_index].material
-                if material:
+        material_slots = slot_source.material_slots
+        num_slots = len(material_slots)
+
+        # Only the material indices that are used and have a slot need resolving to colors
+        face_counts = np.bincount(face_materials, minlength=num_slots)[:num_slots]
+        for material_index in np.flatnonzero(face_counts).tolist():
+            material = material_slots[material_index].material
+            if material:
+                material_pointer = material.as_pointer()
+                if material_pointer in material_colors:
+                    color = material_colors[material_pointer]
+                else:
                     color = material_to_hex_color(material)
-                    if color:
-                        unique_colors.add(color)
-                        debug(f"Face {face.index}: material={material.name}, color={color}")
-
-        eval_object.to_mesh_clear()
+                    material_colors[material_pointer] = color
+                if color:
+                    unique_colors.add(color)
+                    debug(f"Material index {material_index}: material={material.name}, color={color}")
 
     # Sort colors for consistent ordering and create index mapping
     # IMPORTANT: Start at index 1 because Orca's paint_color codes:
@@ -220,6 +403,48 @@ def collect_face_colors(
     return color_to_index
 
 
+def _face_material_indices(
+    blender_object: bpy.types.Object, eval_object: bpy.types.Object, use_mesh_modifiers: bool
+) -> Optional[np.ndarray]:
+    """
+    Read the material index of every face of an object's exported mesh.
+
+    Material indices are all the color collection needs, so a temporary mesh is only built with
+    ``to_mesh()`` when modifiers have to be evaluated, or when the object is in Edit Mode and its
+    mesh data may be out of date. Otherwise they are read straight from the object's own mesh.
+
+    :param blender_object: The original object.
+    :param eval_object: The evaluated object, or *blender_object* when modifiers are not applied.
+    :param use_mesh_modifiers: Whether modifiers are applied to the exported mesh.
+    :return: The material index of each face, or None if the mesh could not be obtained.
+    """
+    owns_mesh = blender_object.mode == "EDIT" or (use_mesh_modifiers and len(blender_object.modifiers) > 0)
+    if owns_mesh:
+        try:
+            mesh = eval_object.to_mesh()
+        except RuntimeError:
+            warn(f"Could not get mesh for object: {blender_object.name}")
+            return None
+    else:
+        mesh = blender_object.data
+
+    try:
+        if mesh is None:
+            warn(f"Mesh is None for object: {blender_object.name}")
+            return None
+
+        debug(f"Object {blender_object.name}: {len(mesh.vertices)} vertices, {len(mesh.polygons)} faces")
+
+        # Read every face's material index in one call
+        face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", face_materials)
+        return face_materials
+    finally:
+        # Free the temporary mesh even if reading it failed
+        if owns_mesh:
+            eval_object.to_mesh_clear()
+
+
 def write_materials(
     resources_element: xml.etree.ElementTree.Element,
     blender_objects: List[bpy.types.Object],
@@ -271,13 +496,13 @@ def write_materials(
             # Create m:colorgroup element
             colorgroup_element = xml.etree.ElementTree.SubElement(
                 resources_element,
-                f"{{{MATERIAL_NAMESPACE}}}colorgroup",
+                _COLORGROUP,
                 attrib={"id": str(colorgroup_id)},
             )
             # Add m:color child with the color
             xml.etree.ElementTree.SubElement(
                 colorgroup_element,
-                f"{{{MATERIAL_NAMESPACE}}}color",
+                _COLOR,
                 attrib={"color": color_hex},
             )
             # Map color hex to colorgroup ID for object/triangle assignment
@@ -304,32 +529,28 @@ def write_materials(
                 continue
 
             # Read linear color from Blender and convert to sRGB for 3MF hex.
-            principled = bpy_extras.node_shader_utils.PrincipledBSDFWrapper(material, is_readonly=True)
+            principled = read_principled_values(material)
             color = principled.base_color
-            red = min(255, max(0, round(linear_to_srgb(color[0]) * 255)))
-            green = min(255, max(0, round(linear_to_srgb(color[1]) * 255)))
-            blue = min(255, max(0, round(linear_to_srgb(color[2]) * 255)))
+            channels = _srgb_bytes(color)
             alpha = principled.alpha
-            if alpha >= 1.0:
-                color_hex = "#%0.2X%0.2X%0.2X" % (red, green, blue)
-            else:
-                alpha = min(255, round(alpha * 255))
-                color_hex = "#%0.2X%0.2X%0.2X%0.2X" % (red, green, blue, alpha)
+            if alpha < 1.0:
+                channels += (min(255, max(0, round(alpha * 255))),)
+            color_hex = "#" + bytes(channels).hex().upper()
 
             if basematerials_element is None:
                 material_resource_id = str(next_resource_id)
                 next_resource_id += 1
                 basematerials_element = xml.etree.ElementTree.SubElement(
                     resources_element,
-                    f"{{{MODEL_NAMESPACE}}}basematerials",
-                    attrib={f"{{{MODEL_NAMESPACE}}}id": material_resource_id},
+                    _BASEMATERIALS,
+                    attrib={_ID: material_resource_id},
                 )
             xml.etree.ElementTree.SubElement(
                 basematerials_element,
-                f"{{{MODEL_NAMESPACE}}}base",
+                _BASE,
                 attrib={
-                    f"{{{MODEL_NAMESPACE}}}name": material_name,
-                    f"{{{MODEL_NAMESPACE}}}displaycolor": color_hex,
+                    _NAME: material_name,
+                    _DISPLAYCOLOR: color_hex,
                 },
             )
             name_to_index[material_name] = next_index
@@ -388,9 +609,10 @@ def write_prusa_filament_colors(archive, vertex_colors: Dict[str, int]) -> None:
             extruder_elem.set("color", hex_color.upper())
 
         if len(sorted_colors) > 0:
-            tree = xml.etree.ElementTree.ElementTree(root)
-            with archive.open("Metadata/blender_filament_colors.xml", "w") as f:
-                tree.write(f, xml_declaration=True, encoding="UTF-8")
+            archive.writestr(
+                "Metadata/blender_filament_colors.xml",
+                xml.etree.ElementTree.tostring(root, xml_declaration=True, encoding="UTF-8"),
+            )
 
             debug(f"Wrote {len(sorted_colors)} filament color mappings to metadata (fallback only)")
     except Exception as e:
@@ -30,15 +30,96 @@ import os
 import tempfile
 import xml.etree.ElementTree
 import zipfile
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import bpy
 
 from ...common.constants import MATERIAL_NAMESPACE, MODEL_NAMESPACE
+from ...common.extensions import MATERIALS_EXTENSION
 from ...common import debug, warn, error
 
+# Register the materials prefix once so serialization never has to invent ns0-style prefixes.
+xml.etree.ElementTree.register_namespace(MATERIALS_EXTENSION.prefix, MATERIAL_NAMESPACE)
+
+# Scene custom properties holding passthrough material data, as stored by the importer.
+_PASSTHROUGH_KEYS = (
+    "3mf_compositematerials",
+    "3mf_multiproperties",
+    "3mf_pbr_texture_displays",
+    "3mf_colorgroups",
+    "3mf_pbr_display_props",
+    "3mf_textures",
+    "3mf_texture_groups",
+)
+
+# Qualified element names, built once rather than per written element.
+_COLOR = f"{{{MATERIAL_NAMESPACE}}}color"
+_COLORGROUP = f"{{{MATERIAL_NAMESPACE}}}colorgroup"
+_COMPOSITE = f"{{{MATERIAL_NAMESPACE}}}composite"
+_COMPOSITEMATERIALS = f"{{{MATERIAL_NAMESPACE}}}compositematerials"
+_MULTIPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}multiproperties"
+_PBMETALLIC = f"{{{MATERIAL_NAMESPACE}}}pbmetallic"
+_PBMETALLICDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbmetallicdisplayproperties"
+_PBMETALLICTEXTUREDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbmetallictexturedisplayproperties"
+_PBSPECULAR = f"{{{MATERIAL_NAMESPACE}}}pbspecular"
+_PBSPECULARDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbspeculardisplayproperties"
+_PBSPECULARTEXTUREDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbspeculartexturedisplayproperties"
+_TEX2COORD = f"{{{MATERIAL_NAMESPACE}}}tex2coord"
+_TEXTURE2D = f"{{{MATERIAL_NAMESPACE}}}texture2d"
+_TEXTURE2DGROUP = f"{{{MATERIAL_NAMESPACE}}}texture2dgroup"
+_TRANSLUCENT = f"{{{MATERIAL_NAMESPACE}}}translucent"
+_TRANSLUCENTDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}translucentdisplayproperties"
+_MULTI = f"{{{MODEL_NAMESPACE}}}multi"  # <multi> is in the core namespace
+
+# Optional texture2d attributes with their spec defaults; only non-default values are written.
+_TEXTURE_DEFAULTS = (("tilestyleu", "wrap"), ("tilestylev", "wrap"), ("filter", "auto"))
+
+
+class _IdRemap(dict):
+    """Resource ID mapping that leaves IDs without an entry unchanged."""
+
+    def __missing__(self, key: str) -> str:
+        return key
+
+
+def has_passthrough_materials(scene: bpy.types.Scene) -> bool:
+    """
+    Check whether the scene holds any passthrough material data from a prior import.
+
+    Stops at the first property found, without parsing anything.
+
+    :param scene: The Blender scene to check.
+    :return: True if at least one passthrough property is set and non-empty.
+    """
+    return any(scene.get(key) for key in _PASSTHROUGH_KEYS)
+
 
-def write_passthrough_textures_to_archive(archive: zipfile.ZipFile) -> Dict[str, str]:
+def read_passthrough_data() -> Dict[str, dict]:
+    """
+    Read and parse the passthrough material data stored on the scene.
+
+    Each scene property is read and decoded exactly once so that the archive,
+    resource and triangle writers can share the result.
+
+    :return: Dict mapping scene property name -> parsed data. Properties that are
+             missing, empty or fail to parse are left out.
+    """
+    scene = bpy.context.scene
+    parsed = {}
+    for key in _PASSTHROUGH_KEYS:
+        raw = scene.get(key)
+        if not raw:
+            continue
+        try:
+            parsed[key] = json.loads(raw)
+        except json.JSONDecodeError:
+            warn(f"Failed to parse stored passthrough data '{key}'")
+    return parsed
+
+
+def write_passthrough_textures_to_archive(
+    archive: zipfile.ZipFile, passthrough_data: Optional[Dict[str, dict]] = None
+) -> Dict[str, str]:
     """
     Write passthrough texture images from Blender data to the 3MF archive.
 
@@ -50,17 +131,14 @@ def write_passthrough_textures_to_archive(archive: zipfile.ZipFile) -> Dict[str,
     exist in the archive before their XML references are written.
 
     :param archive: The 3MF zip archive to write to.
+    :param passthrough_data: Parsed passthrough data from read_passthrough_data().
+                             Read from the scene when not given.
     :return: Dict mapping archive path -> content type for relationship writing.
     """
-    scene = bpy.context.scene
-    stored_data = scene.get("3mf_textures")
-    if not stored_data:
-        return {}
-
-    try:
-        texture_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored textures data for image writing")
+    if passthrough_data is None:
+        passthrough_data = read_passthrough_data()
+    texture_data = passthrough_data.get("3mf_textures")
+    if not texture_data:
         return {}
 
     image_paths = {}
@@ -128,7 +206,9 @@ def write_passthrough_textures_to_archive(archive: zipfile.ZipFile) -> Dict[str,
 
 
 def write_passthrough_materials(
-    resources_element: xml.etree.ElementTree.Element, next_resource_id: int
+    resources_element: xml.etree.ElementTree.Element,
+    next_resource_id: int,
+    passthrough_data: Optional[Dict[str, dict]] = None,
 ) -> Tuple[int, bool, Dict[str, str]]:
     """
     Write stored passthrough material data from scene custom properties.
@@ -141,33 +221,16 @@ def write_passthrough_materials(
 
     :param resources_element: The <resources> element
     :param next_resource_id: Next available resource ID
+    :param passthrough_data: Parsed passthrough data from read_passthrough_data().
+                             Read from the scene when not given.
     :return: Tuple of (updated next_resource_id, whether any passthrough data was written,
              id_remap dict mapping original IDs to new IDs)
     """
-    scene = bpy.context.scene
-    any_written = False
-
-    # Check if any passthrough data exists
-    has_composites = bool(scene.get("3mf_compositematerials"))
-    has_multiprops = bool(scene.get("3mf_multiproperties"))
-    has_pbr_tex = bool(scene.get("3mf_pbr_texture_displays"))
-    has_colorgroups = bool(scene.get("3mf_colorgroups"))
-    has_pbr_display = bool(scene.get("3mf_pbr_display_props"))
-    has_textures = bool(scene.get("3mf_textures"))
-    has_tex_groups = bool(scene.get("3mf_texture_groups"))
-
-    if (
-        has_composites
-        or has_multiprops
-        or has_pbr_tex
-        or has_colorgroups
-        or has_pbr_display
-        or has_textures
-        or has_tex_groups
-    ):
-        any_written = True
-    else:
+    if passthrough_data is None:
+        passthrough_data = read_passthrough_data()
+    if not passthrough_data:
         return next_resource_id, False, {}
+    any_written = True
 
     # Build ID remap table: original_id -> new_id
     # This prevents conflicts with newly created materials
@@ -175,74 +238,25 @@ def write_passthrough_materials(
     id_remap = {}
 
     # Collect all original IDs that need remapping
-    original_ids = set()
-
-    if has_textures:
-        try:
-            tex_data = json.loads(scene.get("3mf_textures", "{}"))
-            original_ids.update(tex_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    if has_tex_groups:
-        try:
-            group_data = json.loads(scene.get("3mf_texture_groups", "{}"))
-            original_ids.update(group_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    if has_colorgroups:
-        try:
-            cg_data = json.loads(scene.get("3mf_colorgroups", "{}"))
-            original_ids.update(cg_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    if has_pbr_display:
-        try:
-            pbr_data = json.loads(scene.get("3mf_pbr_display_props", "{}"))
-            original_ids.update(pbr_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    if has_composites:
-        try:
-            comp_data = json.loads(scene.get("3mf_compositematerials", "{}"))
-            original_ids.update(comp_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    if has_multiprops:
-        try:
-            mp_data = json.loads(scene.get("3mf_multiproperties", "{}"))
-            original_ids.update(mp_data.keys())
-        except json.JSONDecodeError:
-            pass
+    original_ids = set().union(*(data.keys() for data in passthrough_data.values()))
 
-    if has_pbr_tex:
-        try:
-            pbr_tex_data = json.loads(scene.get("3mf_pbr_texture_displays", "{}"))
-            original_ids.update(pbr_tex_data.keys())
-        except json.JSONDecodeError:
-            pass
-
-    # Find IDs that would conflict with newly created materials (IDs 1 to next_resource_id-1)
-    conflicting_ids = set()
-    non_conflicting_int_ids = set()
+    # Convert each numeric ID once; non-numeric IDs can never conflict
+    int_ids = {}
     for orig_id in original_ids:
         try:
-            id_int = int(orig_id)
-            if id_int < next_resource_id:
-                conflicting_ids.add(orig_id)
-            else:
-                non_conflicting_int_ids.add(id_int)
+            int_ids[orig_id] = int(orig_id)
         except ValueError:
             pass
 
+    # Find IDs that would conflict with newly created materials (IDs 1 to next_resource_id-1)
+    conflicting_ids = sorted((id_int, orig_id) for orig_id, id_int in int_ids.items() if id_int < next_resource_id)
+    non_conflicting_int_ids = {id_int for id_int in int_ids.values() if id_int >= next_resource_id}
+    max_original_id = max(int_ids.values(), default=0)
+
     # Only remap conflicting IDs, assign them new unique IDs starting from next_resource_id
     # Skip over IDs that are already used by non-conflicting original IDs
     if conflicting_ids:
-        for orig_id in sorted(conflicting_ids, key=lambda x: int(x) if x.isdigit() else 0):
+        for _, orig_id in conflicting_ids:
             while next_resource_id in non_conflicting_int_ids:
                 next_resource_id += 1
             id_remap[orig_id] = str(next_resource_id)
@@ -251,77 +265,55 @@ def write_passthrough_materials(
 
     # Update next_resource_id to account for non-conflicting original IDs
     # This ensures objects don't use IDs that overlap with passthrough
-    max_original_id = max((int(x) for x in original_ids if x.isdigit()), default=0)
     if max_original_id >= next_resource_id:
         next_resource_id = max_original_id + 1
 
-    # Write textures first (they may be referenced by other elements)
-    _write_passthrough_textures(resources_element, scene, id_remap)
-
-    # Write texture groups (referenced by multiproperties)
-    _write_passthrough_texture_groups(resources_element, scene, id_remap)
+    # Identity entries for every original ID turn the writers' lookups into a single hash
+    remap = _IdRemap(zip(original_ids, original_ids))
+    remap.update(id_remap)
 
-    # Write colorgroups
-    _write_passthrough_colorgroups(resources_element, scene, id_remap)
-
-    # Write non-textured PBR display properties
-    _write_passthrough_pbr_display(resources_element, scene, id_remap)
-
-    # Write compositematerials
-    _write_passthrough_composites(resources_element, scene, id_remap)
-
-    # Write multiproperties
-    _write_passthrough_multiproperties(resources_element, scene, id_remap)
-
-    # Write textured PBR display properties
-    _write_passthrough_pbr_textures(resources_element, scene, id_remap)
+    for key, writer in _PASSTHROUGH_WRITERS:
+        data = passthrough_data.get(key)
+        if data:
+            writer(resources_element, data, remap)
 
     return next_resource_id, any_written, id_remap
 
 
 def _write_passthrough_composites(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    composite_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored compositematerials to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param composite_data: Parsed "3mf_compositematerials" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_compositematerials")
-    if not stored_data:
-        return
-
-    try:
-        composite_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored compositematerials data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, comp in composite_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         attrib = {
             "id": new_id,
-            "matid": id_remap.get(comp["matid"], comp["matid"]),
+            "matid": id_remap[comp["matid"]],
             "matindices": comp["matindices"],
         }
-        if comp.get("displaypropertiesid"):
-            attrib["displaypropertiesid"] = id_remap.get(comp["displaypropertiesid"], comp["displaypropertiesid"])
+        if dp_id := comp.get("displaypropertiesid"):
+            attrib["displaypropertiesid"] = id_remap[dp_id]
 
-        comp_element = xml.etree.ElementTree.SubElement(
+        comp_element = sub_element(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}compositematerials",
+            _COMPOSITEMATERIALS,
             attrib=attrib,
         )
 
         # Write composite children
         for c in comp.get("composites", []):
-            xml.etree.ElementTree.SubElement(
+            sub_element(
                 comp_element,
-                f"{{{MATERIAL_NAMESPACE}}}composite",
+                _COMPOSITE,
                 attrib={"values": c.get("values", "")},
             )
 
@@ -332,44 +324,34 @@ def _write_passthrough_composites(
 
 def _write_passthrough_textures(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    texture_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored texture2d elements to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param texture_data: Parsed "3mf_textures" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_textures")
-    if not stored_data:
-        return
-
-    try:
-        texture_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored textures data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, tex in texture_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         attrib = {
             "id": new_id,
             "path": tex.get("path", ""),
             "contenttype": tex.get("contenttype", "image/png"),
+            # Add optional attributes if not default
+            **{
+                name: value
+                for name, default in _TEXTURE_DEFAULTS
+                if (value := tex.get(name)) and value != default
+            },
         }
-        # Add optional attributes if not default
-        if tex.get("tilestyleu") and tex.get("tilestyleu") != "wrap":
-            attrib["tilestyleu"] = tex["tilestyleu"]
-        if tex.get("tilestylev") and tex.get("tilestylev") != "wrap":
-            attrib["tilestylev"] = tex["tilestylev"]
-        if tex.get("filter") and tex.get("filter") != "auto":
-            attrib["filter"] = tex["filter"]
-
-        xml.etree.ElementTree.SubElement(
+
+        sub_element(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}texture2d",
+            _TEXTURE2D,
             attrib=attrib,
         )
 
@@ -380,49 +362,39 @@ def _write_passthrough_textures(
 
 def _write_passthrough_texture_groups(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    texgroup_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored texture2dgroup elements to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param texgroup_data: Parsed "3mf_texture_groups" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_texture_groups")
-    if not stored_data:
-        return
-
-    try:
-        texgroup_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored texture groups data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, tg in texgroup_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         texid = tg.get("texid", "")
         attrib = {
             "id": new_id,
-            "texid": id_remap.get(texid, texid),
+            "texid": id_remap[texid],
         }
-        if tg.get("displaypropertiesid"):
-            dp_id = tg["displaypropertiesid"]
-            attrib["displaypropertiesid"] = id_remap.get(dp_id, dp_id)
+        if dp_id := tg.get("displaypropertiesid"):
+            attrib["displaypropertiesid"] = id_remap[dp_id]
 
-        group_element = xml.etree.ElementTree.SubElement(
+        group_element = sub_element(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}texture2dgroup",
+            _TEXTURE2DGROUP,
             attrib=attrib,
         )
 
         # Write tex2coord children
         for coord in tg.get("tex2coords", []):
             if isinstance(coord, (list, tuple)) and len(coord) >= 2:
-                xml.etree.ElementTree.SubElement(
+                sub_element(
                     group_element,
-                    f"{{{MATERIAL_NAMESPACE}}}tex2coord",
+                    _TEX2COORD,
                     attrib={"u": str(coord[0]), "v": str(coord[1])},
                 )
 
@@ -433,44 +405,34 @@ def _write_passthrough_texture_groups(
 
 def _write_passthrough_colorgroups(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    colorgroup_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored colorgroup elements to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param colorgroup_data: Parsed "3mf_colorgroups" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_colorgroups")
-    if not stored_data:
-        return
-
-    try:
-        colorgroup_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored colorgroups data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, cg in colorgroup_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         attrib = {"id": new_id}
-        if cg.get("displaypropertiesid"):
-            dp_id = cg["displaypropertiesid"]
-            attrib["displaypropertiesid"] = id_remap.get(dp_id, dp_id)
+        if dp_id := cg.get("displaypropertiesid"):
+            attrib["displaypropertiesid"] = id_remap[dp_id]
 
-        group_element = xml.etree.ElementTree.SubElement(
+        group_element = sub_element(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}colorgroup",
+            _COLORGROUP,
             attrib=attrib,
         )
 
         # Write color children
         for color in cg.get("colors", []):
-            xml.etree.ElementTree.SubElement(
+            sub_element(
                 group_element,
-                f"{{{MATERIAL_NAMESPACE}}}color",
+                _COLOR,
                 attrib={"color": color},
             )
 
@@ -481,45 +443,36 @@ def _write_passthrough_colorgroups(
 
 def _write_passthrough_pbr_display(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    pbr_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored non-textured PBR display properties to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param pbr_data: Parsed "3mf_pbr_display_props" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_pbr_display_props")
-    if not stored_data:
-        return
-
-    try:
-        pbr_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored PBR display props data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, prop in pbr_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         prop_type = prop.get("type", "metallic")
         properties = prop.get("properties", [])
 
         if prop_type == "metallic":
-            element_name = f"{{{MATERIAL_NAMESPACE}}}pbmetallicdisplayproperties"
-            child_name = f"{{{MATERIAL_NAMESPACE}}}pbmetallic"
+            element_name = _PBMETALLICDISPLAYPROPERTIES
+            child_name = _PBMETALLIC
         elif prop_type == "specular":
-            element_name = f"{{{MATERIAL_NAMESPACE}}}pbspeculardisplayproperties"
-            child_name = f"{{{MATERIAL_NAMESPACE}}}pbspecular"
+            element_name = _PBSPECULARDISPLAYPROPERTIES
+            child_name = _PBSPECULAR
         elif prop_type == "translucent":
-            element_name = f"{{{MATERIAL_NAMESPACE}}}translucentdisplayproperties"
-            child_name = f"{{{MATERIAL_NAMESPACE}}}translucent"
+            element_name = _TRANSLUCENTDISPLAYPROPERTIES
+            child_name = _TRANSLUCENT
         else:
             warn(f"Unknown PBR display property type: {prop_type}")
             continue
 
-        display_element = xml.etree.ElementTree.SubElement(
+        display_element = sub_element(
             resources_element,
             element_name,
             attrib={"id": new_id},
@@ -527,7 +480,7 @@ def _write_passthrough_pbr_display(
 
         # Write child elements with their raw attributes
         for prop_dict in properties:
-            xml.etree.ElementTree.SubElement(
+            sub_element(
                 display_element,
                 child_name,
                 attrib=prop_dict,
@@ -540,51 +493,47 @@ def _write_passthrough_pbr_display(
 
 def _write_passthrough_multiproperties(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    multi_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored multiproperties to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param multi_data: Parsed "3mf_multiproperties" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_multiproperties")
-    if not stored_data:
-        return
-
-    try:
-        multi_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored multiproperties data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
+    # Multiproperties frequently share the same pids list, so remap each distinct list once
+    remapped_pids_cache: Dict[str, str] = {}
     for res_id, multi in multi_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         # Remap pids - space-separated list of resource IDs
-        orig_pids = multi["pids"].split()
-        remapped_pids = " ".join(id_remap.get(pid, pid) for pid in orig_pids)
+        orig_pids = multi["pids"]
+        remapped_pids = remapped_pids_cache.get(orig_pids)
+        if remapped_pids is None:
+            remapped_pids = " ".join(map(id_remap.__getitem__, orig_pids.split()))
+            remapped_pids_cache[orig_pids] = remapped_pids
 
+        blendmethods = multi.get("blendmethods")
         attrib = {
             "id": new_id,
             "pids": remapped_pids,
+            **({"blendmethods": blendmethods} if blendmethods else {}),
         }
-        if multi.get("blendmethods"):
-            attrib["blendmethods"] = multi["blendmethods"]
 
-        multi_element = xml.etree.ElementTree.SubElement(
+        multi_element = sub_element(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}multiproperties",
+            _MULTIPROPERTIES,
             attrib=attrib,
         )
 
         # Write multi children
         # Note: <multi> elements are in the core namespace, not materials namespace
         for m in multi.get("multis", []):
-            xml.etree.ElementTree.SubElement(
+            sub_element(
                 multi_element,
-                f"{{{MODEL_NAMESPACE}}}multi",
+                _MULTI,
                 attrib={"pindices": m.get("pindices", "")},
             )
 
@@ -595,80 +544,59 @@ def _write_passthrough_multiproperties(
 
 def _write_passthrough_pbr_textures(
     resources_element: xml.etree.ElementTree.Element,
-    scene: bpy.types.Scene,
+    pbr_data: Dict[str, dict],
     id_remap: Dict[str, str],
 ) -> None:
     """
     Write stored textured PBR display properties to XML.
 
     :param resources_element: The <resources> element
-    :param scene: Blender scene with stored data
-    :param id_remap: Mapping from original IDs to new IDs
+    :param pbr_data: Parsed "3mf_pbr_texture_displays" data, keyed by original resource ID
+    :param id_remap: Mapping from original IDs to new IDs, returning unknown IDs unchanged
     """
-    stored_data = scene.get("3mf_pbr_texture_displays")
-    if not stored_data:
-        return
-
-    try:
-        pbr_data = json.loads(stored_data)
-    except json.JSONDecodeError:
-        warn("Failed to parse stored PBR texture displays data")
-        return
-
+    sub_element = xml.etree.ElementTree.SubElement
     for res_id, prop in pbr_data.items():
-        new_id = id_remap.get(res_id, res_id)
+        new_id = id_remap[res_id]
         prop_type = prop.get("type", "specular")
         factors = prop.get("factors", {})
 
         if prop_type == "specular":
-            primary_tex = prop.get("primary_texid", "")
-            secondary_tex = prop.get("secondary_texid", "")
-            diffuse_tex = prop.get("basecolor_texid", "")  # diffusetextureid in specular workflow
-            attrib = {
-                "id": new_id,
-                "name": prop.get("name", ""),
-            }
-            # Only include texture IDs if they have values
-            if primary_tex:
-                attrib["speculartextureid"] = id_remap.get(primary_tex, primary_tex)
-            if secondary_tex:
-                attrib["glossinesstextureid"] = id_remap.get(secondary_tex, secondary_tex)
-            if diffuse_tex:
-                attrib["diffusetextureid"] = id_remap.get(diffuse_tex, diffuse_tex)
-            # Add factor attributes
-            for factor_name, factor_value in factors.items():
-                attrib[factor_name] = factor_value
-
-            xml.etree.ElementTree.SubElement(
-                resources_element,
-                f"{{{MATERIAL_NAMESPACE}}}pbspeculartexturedisplayproperties",
-                attrib=attrib,
-            )
+            tex_names = ("speculartextureid", "glossinesstextureid", "diffusetextureid")
+            element_name = _PBSPECULARTEXTUREDISPLAYPROPERTIES
         elif prop_type == "metallic":
-            primary_tex = prop.get("primary_texid", "")
-            secondary_tex = prop.get("secondary_texid", "")
-            basecolor_tex = prop.get("basecolor_texid", "")
-            attrib = {
-                "id": new_id,
-                "name": prop.get("name", ""),
-            }
-            # Only include texture IDs if they have values
-            if primary_tex:
-                attrib["metallictextureid"] = id_remap.get(primary_tex, primary_tex)
-            if secondary_tex:
-                attrib["roughnesstextureid"] = id_remap.get(secondary_tex, secondary_tex)
-            if basecolor_tex:
-                attrib["basecolortextureid"] = id_remap.get(basecolor_tex, basecolor_tex)
-            # Add factor attributes
-            for factor_name, factor_value in factors.items():
-                attrib[factor_name] = factor_value
-
-            xml.etree.ElementTree.SubElement(
-                resources_element,
-                f"{{{MATERIAL_NAMESPACE}}}pbmetallictexturedisplayproperties",
-                attrib=attrib,
-            )
+            tex_names = ("metallictextureid", "roughnesstextureid", "basecolortextureid")
+            element_name = _PBMETALLICTEXTUREDISPLAYPROPERTIES
+        else:
+            continue
+
+        # Only include texture IDs if they have values.
+        # basecolor_texid holds the diffusetextureid in the specular workflow.
+        tex_ids = (prop.get("primary_texid", ""), prop.get("secondary_texid", ""), prop.get("basecolor_texid", ""))
+        tex_attrs = {name: id_remap[tex_id] for name, tex_id in zip(tex_names, tex_ids) if tex_id}
+        attrib = {
+            "id": new_id,
+            "name": prop.get("name", ""),
+            **tex_attrs,
+            **factors,
+        }
+
+        sub_element(resources_element, element_name, attrib=attrib)
 
         debug(f"Wrote passthrough {prop_type} PBR texture display {res_id} -> {new_id}")
 
     debug(f"Wrote {len(pbr_data)} passthrough PBR texture displays")
+
+
+# Writers in output order. Textures come first since other resources may reference them,
+# and texture groups must precede the multiproperties that reference them.
+# Each writer binds SubElement to a local name, since texture groups and colorgroups can hold
+# thousands of child elements.
+_PASSTHROUGH_WRITERS = (
+    ("3mf_textures", _write_passthrough_textures),
+    ("3mf_texture_groups", _write_passthrough_texture_groups),
+    ("3mf_colorgroups", _write_passthrough_colorgroups),
+    ("3mf_pbr_display_props", _write_passthrough_pbr_display),
+    ("3mf_compositematerials", _write_passthrough_composites),
+    ("3mf_multiproperties", _write_passthrough_multiproperties),
+    ("3mf_pbr_texture_displays", _write_passthrough_pbr_textures),
+)
@@ -25,15 +25,24 @@ import xml.etree.ElementTree
 from typing import Dict, List, Tuple
 
 import bpy
-import bpy_extras.node_shader_utils
+import numpy as np
 
 from ...common.constants import MATERIAL_NAMESPACE
 from ...common import debug
+from .base import PrincipledValues
+
+# Qualified element names, built once rather than per written material.
+_PBMETALLIC = f"{{{MATERIAL_NAMESPACE}}}pbmetallic"
+_PBMETALLICDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbmetallicdisplayproperties"
+_PBSPECULAR = f"{{{MATERIAL_NAMESPACE}}}pbspecular"
+_PBSPECULARDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}pbspeculardisplayproperties"
+_TRANSLUCENT = f"{{{MATERIAL_NAMESPACE}}}translucent"
+_TRANSLUCENTDISPLAYPROPERTIES = f"{{{MATERIAL_NAMESPACE}}}translucentdisplayproperties"
 
 
 def extract_pbr_from_material(
     material: bpy.types.Material,
-    principled: bpy_extras.node_shader_utils.PrincipledBSDFWrapper,
+    principled: PrincipledValues,
 ) -> Dict:
     """
     Extract PBR properties from a Blender material's Principled BSDF.
@@ -44,32 +53,15 @@ def extract_pbr_from_material(
     - Translucent: refractiveindex (RGB), roughness, attenuation (RGB)
 
     :param material: The Blender material
-    :param principled: PrincipledBSDFWrapper for the material
+    :param principled: Principled BSDF input values read from the material
     :return: Dictionary with PBR properties for export
     """
-
-    # Helper to safely convert values to float (handles MagicMock in unit tests)
-    def safe_float(value, default):
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
-
-    def safe_color(value, default):
-        """Safely extract RGB tuple from color value."""
-        try:
-            if hasattr(value, "__iter__") and len(value) >= 3:
-                return (float(value[0]), float(value[1]), float(value[2]))
-            return default
-        except (TypeError, ValueError, IndexError):
-            return default
-
     # Core PBR properties
-    metallic = safe_float(principled.metallic, 0.0)
-    roughness = safe_float(principled.roughness, 0.5)
-    specular_ior_level = safe_float(principled.specular, 0.5)
-    ior = safe_float(principled.ior, 1.45)
-    base_color = safe_color(principled.base_color, (0.8, 0.8, 0.8))
+    metallic = principled.metallic
+    roughness = principled.roughness
+    specular_ior_level = principled.specular_ior_level
+    ior = principled.ior
+    base_color = principled.base_color
 
     # Calculate specular color for specular workflow
     # In Blender 4.0+, Specular IOR Level controls Fresnel reflectance
@@ -82,28 +74,14 @@ def extract_pbr_from_material(
     # In Blender 4.x, Specular Tint is an RGBA color where WHITE (1,1,1) = no tint
     # We need to detect if it's NOT white to know if tinting is applied
     specular_tint_color = None
-    try:
-        if material.node_tree:
-            for node in material.node_tree.nodes:
-                if node.type == "BSDF_PRINCIPLED":
-                    if "Specular Tint" in node.inputs:
-                        tint_input = node.inputs["Specular Tint"]
-                        if hasattr(tint_input, "default_value"):
-                            val = tint_input.default_value
-                            # Blender 4.x: It's an RGBA color
-                            if hasattr(val, "__iter__") and len(val) >= 3:
-                                # Check if it's NOT white (default = no tint)
-                                r, g, b = float(val[0]), float(val[1]), float(val[2])
-                                if abs(r - 1.0) > 0.01 or abs(g - 1.0) > 0.01 or abs(b - 1.0) > 0.01:
-                                    specular_tint_color = (r, g, b)
-                            else:
-                                # Old Blender: It's a float 0-1
-                                tint_amount = safe_float(val, 0.0)
-                                if tint_amount > 0.01:
-                                    specular_tint_color = base_color[:3]
-                    break
-    except (TypeError, AttributeError):
-        pass
+    tint = principled.specular_tint
+    if isinstance(tint, tuple):
+        r, g, b = tint
+        if abs(r - 1.0) > 0.01 or abs(g - 1.0) > 0.01 or abs(b - 1.0) > 0.01:
+            specular_tint_color = tint
+    elif tint is not None and tint > 0.01:
+        # Old Blender: It's a float 0-1
+        specular_tint_color = base_color[:3]
 
     # Calculate final specular color
     if specular_tint_color is not None:
@@ -120,25 +98,10 @@ def extract_pbr_from_material(
         "specular_ior_level": specular_ior_level,
         "specular_color": specular_color,
         "ior": ior,
-        "transmission": 0.0,
+        "transmission": principled.transmission,
         "attenuation": None,
     }
 
-    # Get transmission from node tree (PrincipledBSDFWrapper may not expose it directly)
-    try:
-        if material.node_tree:
-            for node in material.node_tree.nodes:
-                if node.type == "BSDF_PRINCIPLED":
-                    # Blender 4.0+ uses 'Transmission Weight' instead of 'Transmission'
-                    if "Transmission Weight" in node.inputs:
-                        pbr_data["transmission"] = safe_float(node.inputs["Transmission Weight"].default_value, 0.0)
-                    elif "Transmission" in node.inputs:
-                        pbr_data["transmission"] = safe_float(node.inputs["Transmission"].default_value, 0.0)
-                    break
-    except (TypeError, AttributeError):
-        # Handle mocked objects in unit tests
-        pass
-
     # Check for stored 3MF attenuation from round-trip
     try:
         if "3mf_attenuation" in material:
@@ -193,15 +156,31 @@ def write_pbr_display_properties(
     if not pbr_materials:
         return next_resource_id
 
-    # Check if any material has meaningful PBR data (not just defaults)
-    def has_meaningful_pbr(pbr):
-        metallic_check = pbr.get("metallic", 0) > 0.01
-        roughness_check = pbr.get("roughness", 1) < 0.99
-        transmission_check = pbr.get("transmission", 0) > 0.01
-        specular_check = pbr.get("specular_ior_level", 0.5) != 0.5
-        return metallic_check or roughness_check or transmission_check or specular_check
+    # Pull the values that decide the workflow into one array per property, in a single pass over
+    # the materials, so the checks below are a few vectorized comparisons
+    properties = np.array(
+        [
+            (
+                pbr.get("metallic", 0),
+                pbr.get("roughness", 1),
+                pbr.get("transmission", 0),
+                pbr.get("specular_ior_level", 0.5),
+            )
+            for _, pbr in pbr_materials
+        ],
+        dtype=np.float64,
+    )
+    metallic_values, roughness_values, transmission_values, specular_values = properties.T
 
-    has_pbr_data = any(has_meaningful_pbr(pbr) for _, pbr in pbr_materials)
+    # Check if any material has meaningful PBR data (not just defaults)
+    has_pbr_data = bool(
+        np.any(
+            (metallic_values > 0.01)
+            | (roughness_values < 0.99)
+            | (transmission_values > 0.01)
+            | (specular_values != 0.5)
+        )
+    )
 
     if not has_pbr_data:
         debug("No meaningful PBR data to export, skipping display properties")
@@ -210,34 +189,23 @@ def write_pbr_display_properties(
     # Categorize materials by workflow
     # Any material with metallic > 0.01 uses metallic workflow (not just > 0.5!)
     # Any material with transmission > 0.01 uses translucent workflow
-    translucent_materials = []
-    metallic_materials = []
-    specular_materials = []
-
-    for material_name, pbr in pbr_materials:
-        transmission = pbr.get("transmission", 0)
-        metallic = pbr.get("metallic", 0)
-
-        if transmission > 0.01:
-            translucent_materials.append((material_name, pbr))
-        elif metallic > 0.01:  # Fixed: was > 0.5, which lost partial metallic values!
-            metallic_materials.append((material_name, pbr))
-        else:
-            specular_materials.append((material_name, pbr))
+    translucent_mask = transmission_values > 0.01
+    has_translucent = bool(translucent_mask.any())
+    has_metallic = bool(np.any(~translucent_mask & (metallic_values > 0.01)))
 
     # Write each workflow type as needed
     # Note: 3MF allows only ONE displaypropertiesid per basematerials,
     # so we choose the dominant workflow for all materials
     # Priority: translucent > metallic > specular (most to least specialized)
 
-    if translucent_materials:
+    if has_translucent:
         # Write translucentdisplayproperties for ALL materials
         display_props_id = str(next_resource_id)
         next_resource_id += 1
 
         translucent_props = xml.etree.ElementTree.SubElement(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}translucentdisplayproperties",
+            _TRANSLUCENTDISPLAYPROPERTIES,
             attrib={"id": display_props_id},
         )
 
@@ -247,9 +215,10 @@ def write_pbr_display_properties(
             attenuation = pbr.get("attenuation")
             transmission = pbr.get("transmission", 1.0)
 
+            ior_text = f"{ior:.6g}"  # The same index of refraction is written for all three channels
             attrib = {
                 "name": material_name,
-                "refractiveindex": f"{ior:.6g} {ior:.6g} {ior:.6g}",
+                "refractiveindex": f"{ior_text} {ior_text} {ior_text}",
                 "roughness": f"{roughness:.6g}",
             }
 
@@ -265,21 +234,21 @@ def write_pbr_display_properties(
 
             xml.etree.ElementTree.SubElement(
                 translucent_props,
-                f"{{{MATERIAL_NAMESPACE}}}translucent",
+                _TRANSLUCENT,
                 attrib=attrib,
             )
 
         basematerials_element.set("displaypropertiesid", display_props_id)
         debug(f"Exported {len(pbr_materials)} translucent display properties (ID: {display_props_id})")
 
-    elif metallic_materials:
+    elif has_metallic:
         # Write pbmetallicdisplayproperties for ALL materials
         display_props_id = str(next_resource_id)
         next_resource_id += 1
 
         metallic_props = xml.etree.ElementTree.SubElement(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}pbmetallicdisplayproperties",
+            _PBMETALLICDISPLAYPROPERTIES,
             attrib={"id": display_props_id},
         )
 
@@ -289,7 +258,7 @@ def write_pbr_display_properties(
 
             xml.etree.ElementTree.SubElement(
                 metallic_props,
-                f"{{{MATERIAL_NAMESPACE}}}pbmetallic",
+                _PBMETALLIC,
                 attrib={
                     "name": material_name,
                     "metallicness": f"{metallic:.6g}",
@@ -307,23 +276,23 @@ def write_pbr_display_properties(
 
         specular_props = xml.etree.ElementTree.SubElement(
             resources_element,
-            f"{{{MATERIAL_NAMESPACE}}}pbspeculardisplayproperties",
+            _PBSPECULARDISPLAYPROPERTIES,
             attrib={"id": display_props_id},
         )
 
-        for material_name, pbr in pbr_materials:
-            specular_color = pbr.get("specular_color", (0.22, 0.22, 0.22))
-            glossiness = pbr.get("glossiness", 0.5)
+        # Convert all specular colors to 0-255 channel values in one pass (truncating, as before)
+        specular_colors = np.array(
+            [pbr.get("specular_color", (0.22, 0.22, 0.22))[:3] for _, pbr in pbr_materials], dtype=np.float64
+        )
+        specular_bytes = np.clip((specular_colors * 255).astype(np.int64), 0, 255).tolist()
 
-            # Convert linear specular color to sRGB hex
-            sr = min(255, max(0, int(specular_color[0] * 255)))
-            sg = min(255, max(0, int(specular_color[1] * 255)))
-            sb = min(255, max(0, int(specular_color[2] * 255)))
-            specular_hex = "#%02X%02X%02X" % (sr, sg, sb)
+        for (material_name, pbr), specular_rgb in zip(pbr_materials, specular_bytes):
+            glossiness = pbr.get("glossiness", 0.5)
+            specular_hex = "#" + bytes(specular_rgb).hex().upper()
 
             xml.etree.ElementTree.SubElement(
                 specular_props,
-                f"{{{MATERIAL_NAMESPACE}}}pbspecular",
+                _PBSPECULAR,
                 attrib={
                     "name": material_name,
                     "specularcolor": specular_hex,
@@ -39,6 +39,18 @@ from ...common.constants import (
     RELS_NAMESPACE,
 )
 from ...common import debug, warn, error
+from ...common.images import JPEG_SIGNATURE, PNG_SIGNATURE, read_image_source
+from ..archive import compress_type_for
+from .base import find_principled_node
+
+_TEX2COORD = f"{{{MATERIAL_NAMESPACE}}}tex2coord"
+
+# Leading bytes of the formats textures are written in, by output extension.
+_IMAGE_SIGNATURES = {
+    ".png": PNG_SIGNATURE,
+    ".jpg": JPEG_SIGNATURE,
+    ".jpeg": JPEG_SIGNATURE,
+}
 
 
 def detect_textured_materials(
@@ -60,45 +72,77 @@ def detect_textured_materials(
     """
     textured_materials = {}
 
+    for material_name, material in _unique_node_materials(blender_objects).items():
+        # Find Image Texture node connected to Principled BSDF Base Color
+        image_info = _find_base_color_texture(material)
+        if image_info:
+            textured_materials[material_name] = image_info
+            debug(f"Detected textured material: {material_name}")
+
+    return textured_materials
+
+
+def _unique_node_materials(blender_objects: List[bpy.types.Object]) -> Dict[str, bpy.types.Material]:
+    """
+    Collect the node-based materials used by the objects, each material once.
+
+    Objects commonly share materials, so the detection passes look at each material once
+    instead of once per slot that references it.
+
+    :param blender_objects: Objects whose material slots to read
+    :return: Dict mapping material name -> material, in first-use order
+    """
+    materials = {}
     for blender_object in blender_objects:
         for material_slot in blender_object.material_slots:
             material = material_slot.material
             if material is None or not material.use_nodes:
                 continue
-
+            # Cache material name to protect Unicode characters from garbage collection
             material_name = str(material.name)
-            if material_name in textured_materials:
-                continue
+            if material_name not in materials:
+                materials[material_name] = material
+    return materials
 
-            # Find Image Texture node connected to Principled BSDF Base Color
-            image_info = _find_base_color_texture(material)
-            if image_info:
-                textured_materials[material_name] = image_info
-                debug(f"Detected textured material: {material_name}")
 
-    return textured_materials
+def _analyze_material(material: bpy.types.Material) -> Tuple[Optional[bpy.types.Node], Dict]:
+    """
+    Find a material's Principled BSDF node and index its links by target socket.
 
+    The node is chosen by find_principled_node(), the same one base color and PBR values are read
+    from, so textures and colors always come from one node.
 
-def _find_base_color_texture(material: bpy.types.Material) -> Optional[Dict]:
-    """
-    Find Image Texture node connected to Principled BSDF Base Color input.
+    Every texture lookup starts from the Principled BSDF and follows links backwards, so one pass
+    over the nodes and one over the links can be shared by all lookups on the same material.
 
     :param material: Blender material to analyze
-    :return: Dict with image info, or None if not found
+    :return: Tuple of (Principled BSDF node or None, dict mapping socket -> links into it)
     """
     if not material.node_tree:
-        return None
+        return None, {}
 
-    nodes = material.node_tree.nodes
-    links = material.node_tree.links
+    principled = find_principled_node(material.node_tree)
+    if not principled:
+        return None, {}
+
+    links_by_to_socket = {}
+    for link in material.node_tree.links:
+        links_by_to_socket.setdefault(link.to_socket, []).append(link)
+
+    return principled, links_by_to_socket
 
-    # Find Principled BSDF node
-    principled = None
-    for node in nodes:
-        if node.type == "BSDF_PRINCIPLED":
-            principled = node
-            break
 
+def _find_base_color_texture(
+    material: bpy.types.Material, analysis: Optional[Tuple[Optional[bpy.types.Node], Dict]] = None
+) -> Optional[Dict]:
+    """
+    Find Image Texture node connected to Principled BSDF Base Color input.
+
+    :param material: Blender material to analyze
+    :param analysis: Result of _analyze_material() for this material, if already computed
+    :return: Dict with image info, or None if not found
+    """
+    principled, links_by_to_socket = analysis if analysis is not None else _analyze_material(material)
     if not principled:
         return None
 
@@ -108,70 +152,63 @@ def _find_base_color_texture(material: bpy.types.Material) -> Optional[Dict]:
         return None
 
     # Trace back to find Image Texture node
-    for link in links:
-        if link.to_socket == base_color_input:
-            from_node = link.from_node
-            if from_node.type == "TEX_IMAGE" and from_node.image:
-                image = from_node.image
-
-                # Determine tile style from extension mode
-                extension = getattr(from_node, "extension", "REPEAT")
-                if extension == "CLIP":
-                    tilestyleu = "clamp"
-                    tilestylev = "clamp"
-                elif extension == "EXTEND":
-                    tilestyleu = "mirror"  # Closest approximation
-                    tilestylev = "mirror"
-                else:
-                    tilestyleu = "wrap"
-                    tilestylev = "wrap"
-
-                # Check for stored metadata from import
-                tilestyleu = material.get("3mf_texture_tilestyleu", tilestyleu)
-                tilestylev = material.get("3mf_texture_tilestylev", tilestylev)
-                filter_mode = material.get("3mf_texture_filter", "auto")
-                original_path = material.get("3mf_texture_path", "")
-
-                # Determine filter from interpolation
-                interpolation = getattr(from_node, "interpolation", "Linear")
-                if interpolation == "Closest":
-                    filter_mode = "nearest"
-                elif filter_mode not in ("linear", "nearest"):
-                    filter_mode = "auto"
-
-                return {
-                    "image": image,
-                    "tilestyleu": tilestyleu,
-                    "tilestylev": tilestylev,
-                    "filter": filter_mode,
-                    "original_path": original_path,
-                }
+    for link in links_by_to_socket.get(base_color_input, ()):
+        from_node = link.from_node
+        if from_node.type == "TEX_IMAGE" and from_node.image:
+            image = from_node.image
+
+            # Determine tile style from extension mode
+            extension = getattr(from_node, "extension", "REPEAT")
+            if extension == "CLIP":
+                tilestyleu = "clamp"
+                tilestylev = "clamp"
+            elif extension == "EXTEND":
+                tilestyleu = "mirror"  # Closest approximation
+                tilestylev = "mirror"
+            else:
+                tilestyleu = "wrap"
+                tilestylev = "wrap"
+
+            # Check for stored metadata from import
+            tilestyleu = material.get("3mf_texture_tilestyleu", tilestyleu)
+            tilestylev = material.get("3mf_texture_tilestylev", tilestylev)
+            filter_mode = material.get("3mf_texture_filter", "auto")
+            original_path = material.get("3mf_texture_path", "")
+
+            # Determine filter from interpolation
+            interpolation = getattr(from_node, "interpolation", "Linear")
+            if interpolation == "Closest":
+                filter_mode = "nearest"
+            elif filter_mode not in ("linear", "nearest"):
+                filter_mode = "auto"
+
+            return {
+                "image": image,
+                "tilestyleu": tilestyleu,
+                "tilestylev": tilestylev,
+                "filter": filter_mode,
+                "original_path": original_path,
+            }
 
     return None
 
 
-def _find_texture_from_input(material: bpy.types.Material, input_name: str, non_color: bool = False) -> Optional[Dict]:
+def _find_texture_from_input(
+    material: bpy.types.Material,
+    input_name: str,
+    non_color: bool = False,
+    analysis: Optional[Tuple[Optional[bpy.types.Node], Dict]] = None,
+) -> Optional[Dict]:
     """
     Find Image Texture node connected to a specific Principled BSDF input.
 
     :param material: Blender material to analyze
     :param input_name: Name of the Principled BSDF input (e.g., 'Roughness', 'Metallic')
     :param non_color: Whether this texture should be non-color data
+    :param analysis: Result of _analyze_material() for this material, if already computed
     :return: Dict with image info, or None if not found
     """
-    if not material.node_tree:
-        return None
-
-    nodes = material.node_tree.nodes
-    links = material.node_tree.links
-
-    # Find Principled BSDF node
-    principled = None
-    for node in nodes:
-        if node.type == "BSDF_PRINCIPLED":
-            principled = node
-            break
-
+    principled, links_by_to_socket = analysis if analysis is not None else _analyze_material(material)
     if not principled:
         return None
 
@@ -180,27 +217,28 @@ def _find_texture_from_input(material: bpy.types.Material, input_name: str, non_
     if not target_input or not target_input.is_linked:
         return None
 
-    # Trace back to find Image Texture node (may go through other nodes)
-    def trace_to_image_texture(socket, depth=0):
-        """Recursively trace back through nodes to find Image Texture."""
-        if depth > 10:  # Prevent infinite loops
-            return None
-        for link in links:
-            if link.to_socket == socket:
-                from_node = link.from_node
-                if from_node.type == "TEX_IMAGE" and from_node.image:
-                    return from_node
-                # Check if we can trace through this node (e.g., Normal Map, Invert)
-                if from_node.inputs:
-                    # Try common input names
-                    for input_sock in from_node.inputs:
-                        if input_sock.is_linked:
-                            result = trace_to_image_texture(input_sock, depth + 1)
-                            if result:
-                                return result
-        return None
+    # Trace back to find Image Texture node (may go through other nodes, e.g. Normal Map, Invert).
+    # Depth-first with an explicit stack, visiting links in the same order as a recursive search
+    # would, and each upstream node only once.
+    tex_node = None
+    stack = list(reversed(links_by_to_socket.get(target_input, ())))
+    visited = set()
+    while stack and len(visited) < 64:  # Bound the search on very large node trees
+        from_node = stack.pop().from_node
+        if from_node in visited:
+            continue
+        visited.add(from_node)
+        if from_node.type == "TEX_IMAGE" and from_node.image:
+            tex_node = from_node
+            break
+        upstream_links = [
+            link
+            for input_sock in from_node.inputs
+            if input_sock.is_linked
+            for link in links_by_to_socket.get(input_sock, ())
+        ]
+        stack.extend(reversed(upstream_links))
 
-    tex_node = trace_to_image_texture(target_input)
     if not tex_node:
         return None
 
@@ -258,34 +296,28 @@ def detect_pbr_textured_materials(
     """
     pbr_materials = {}
 
-    for blender_object in blender_objects:
-        for material_slot in blender_object.material_slots:
-            material = material_slot.material
-            if material is None or not material.use_nodes:
-                continue
-
-            material_name = str(material.name)
-            if material_name in pbr_materials:
-                continue
-
-            # Check for PBR textures
-            base_color = _find_base_color_texture(material)
-            roughness = _find_texture_from_input(material, "Roughness", non_color=True)
-            metallic = _find_texture_from_input(material, "Metallic", non_color=True)
-            normal = _find_texture_from_input(material, "Normal", non_color=True)
-
-            # Only include if at least one texture is found
-            if base_color or roughness or metallic or normal:
-                pbr_materials[material_name] = {
-                    "base_color": base_color,
-                    "roughness": roughness,
-                    "metallic": metallic,
-                    "normal": normal,
-                }
-                texture_types = [
-                    t for t in ["base_color", "roughness", "metallic", "normal"] if pbr_materials[material_name][t]
-                ]
-                debug(f"Detected PBR material '{material_name}' with textures: {texture_types}")
+    for material_name, material in _unique_node_materials(blender_objects).items():
+        # Check for PBR textures, sharing one scan of the node tree between the lookups
+        analysis = _analyze_material(material)
+        if analysis[0] is None:
+            continue
+        base_color = _find_base_color_texture(material, analysis)
+        roughness = _find_texture_from_input(material, "Roughness", non_color=True, analysis=analysis)
+        metallic = _find_texture_from_input(material, "Metallic", non_color=True, analysis=analysis)
+        normal = _find_texture_from_input(material, "Normal", non_color=True, analysis=analysis)
+
+        # Only include if at least one texture is found
+        if base_color or roughness or metallic or normal:
+            pbr_materials[material_name] = {
+                "base_color": base_color,
+                "roughness": roughness,
+                "metallic": metallic,
+                "normal": normal,
+            }
+            texture_types = [
+                t for t in ["base_color", "roughness", "metallic", "normal"] if pbr_materials[material_name][t]
+            ]
+            debug(f"Detected PBR material '{material_name}' with textures: {texture_types}")
 
     return pbr_materials
 
@@ -337,27 +369,7 @@ def write_textures_to_archive(archive: zipfile.ZipFile, textured_materials: Dict
             pass
 
         try:
-            # Save image to temporary file, then add to archive
-            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-                tmp_path = tmp.name
-
-            # Determine format for save
-            if ext in (".jpg", ".jpeg"):
-                file_format = "JPEG"
-            else:
-                file_format = "PNG"
-
-            # Save image
-            original_filepath = image.filepath_raw
-            image.filepath_raw = tmp_path
-            image.file_format = file_format
-            image.save()
-            image.filepath_raw = original_filepath
-
-            # Add to archive
-            archive.write(tmp_path, archive_path)
-            os.unlink(tmp_path)
-
+            _write_image_to_archive(archive, image, archive_path, ext)
             image_to_path[image_name] = full_archive_path
             debug(f"Wrote texture '{image_name}' to {archive_path}")
 
@@ -375,6 +387,44 @@ def write_textures_to_archive(archive: zipfile.ZipFile, textured_materials: Dict
     return image_to_path
 
 
+def _write_image_to_archive(archive: zipfile.ZipFile, image: bpy.types.Image, archive_path: str, ext: str) -> None:
+    """
+    Write an image into the archive in the format of the given extension.
+
+    An unmodified file-backed image whose packed or on-disk data is already in that format is
+    copied as-is. Anything else is saved through a temporary file first.
+
+    :param archive: The 3MF zip archive
+    :param image: The image to write
+    :param archive_path: Path of the image inside the archive
+    :param ext: Output extension, which determines the file format
+    """
+    data = read_image_source(image, _IMAGE_SIGNATURES[ext])
+    if data is not None:
+        # Image data is already compressed; compress_type_for stores it rather than deflating again
+        archive.writestr(archive_path, data, compress_type=compress_type_for(data))
+        return
+
+    # Save image to temporary file, then add to archive
+    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
+        tmp_path = tmp.name
+
+    # Saving redirects the image itself, so its path and format are put back even if the save fails
+    original_filepath = image.filepath_raw
+    original_format = image.file_format
+    try:
+        image.filepath_raw = tmp_path
+        image.file_format = "JPEG" if ext in (".jpg", ".jpeg") else "PNG"
+        image.save()
+
+        # PNG and JPEG output is already compressed; deflating it again would only cost time
+        archive.write(tmp_path, archive_path, compress_type=zipfile.ZIP_STORED)
+    finally:
+        image.filepath_raw = original_filepath
+        image.file_format = original_format
+        os.unlink(tmp_path)
+
+
 def write_texture_relationships(archive: zipfile.ZipFile, image_to_path: Dict[str, str]) -> None:
     """
     Write the model's relationship file to declare texture resources.
@@ -402,13 +452,10 @@ def write_texture_relationships(archive: zipfile.ZipFile, image_to_path: Dict[st
 
     # Write to archive at 3D/_rels/3dmodel.model.rels
     rels_path = "3D/_rels/3dmodel.model.rels"
-    tree = xml.etree.ElementTree.ElementTree(relationships_element)
-    with archive.open(rels_path, "w") as f:
-        tree.write(
-            f,
-            xml_declaration=True,
-            encoding="UTF-8",
-        )
+    archive.writestr(
+        rels_path,
+        xml.etree.ElementTree.tostring(relationships_element, xml_declaration=True, encoding="UTF-8"),
+    )
 
     debug(f"Wrote {len(image_to_path)} texture relationships to {rels_path}")
 
@@ -432,7 +479,8 @@ def write_texture_resources(
     """
     material_to_texture_group = {}
 
-    # Track written textures (image path -> texture2d ID)
+    # Track written textures ((image path, tile styles, filter) -> texture2d ID). Materials share a
+    # texture2d only when every attribute written on it matches, not just the image.
     texture_ids = {}
 
     for mat_name, tex_info in textured_materials.items():
@@ -443,9 +491,10 @@ def write_texture_resources(
             continue
 
         archive_path = image_to_path[image_name]
+        texture_key = (archive_path, tex_info["tilestyleu"], tex_info["tilestylev"], tex_info["filter"])
 
-        # Write texture2d element if not already written for this image
-        if archive_path not in texture_ids:
+        # Write texture2d element if not already written for this image and sampling
+        if texture_key not in texture_ids:
             texture_id = str(next_resource_id)
             next_resource_id += 1
 
@@ -474,12 +523,12 @@ def write_texture_resources(
                 f"{{{MATERIAL_NAMESPACE}}}texture2d",
                 attrib=texture_attrib,
             )
-            texture_ids[archive_path] = texture_id
+            texture_ids[texture_key] = texture_id
             debug(f"Created texture2d ID {texture_id} for {archive_path}")
 
         # Create texture2dgroup for this material
         # Note: tex2coord elements will be added when writing triangles
-        texture2d_id = texture_ids[archive_path]
+        texture2d_id = texture_ids[texture_key]
         group_id = str(next_resource_id)
         next_resource_id += 1
 
@@ -499,6 +548,7 @@ def write_texture_resources(
             "tex2coords": {},  # UV tuple -> index mapping
             "next_index": 0,
             "precision": precision,
+            "coordinate_format": f"%.{precision}g",  # Built once rather than per tex2coord
         }
         debug(f"Created texture2dgroup ID {group_id} for material {mat_name}")
 
@@ -527,12 +577,13 @@ def get_or_create_tex2coord(texture_group_data: Dict, u: float, v: float) -> int
     index = texture_group_data["next_index"]
     texture_group_data["next_index"] = index + 1
 
+    coordinate_format = texture_group_data.get("coordinate_format") or f"%.{precision}g"
     xml.etree.ElementTree.SubElement(
         texture_group_data["group_element"],
-        f"{{{MATERIAL_NAMESPACE}}}tex2coord",
+        _TEX2COORD,
         attrib={
-            "u": f"{u_rounded:.{precision}g}",
-            "v": f"{v_rounded:.{precision}g}",
+            "u": coordinate_format % u_rounded,
+            "v": coordinate_format % v_rounded,
         },
     )
 
@@ -588,21 +639,7 @@ def write_pbr_textures_to_archive(archive: zipfile.ZipFile, pbr_materials: Dict[
             full_archive_path = f"/{archive_path}"
 
             try:
-                # Save image to temporary file, then add to archive
-                with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-                    tmp_path = tmp.name
-
-                file_format = "JPEG" if ext in (".jpg", ".jpeg") else "PNG"
-
-                original_filepath = image.filepath_raw
-                image.filepath_raw = tmp_path
-                image.file_format = file_format
-                image.save()
-                image.filepath_raw = original_filepath
-
-                archive.write(tmp_path, archive_path)
-                os.unlink(tmp_path)
-
+                _write_image_to_archive(archive, image, archive_path, ext)
                 image_to_path[image_name] = full_archive_path
                 debug(f"Wrote PBR texture '{image_name}' to {archive_path}")
 
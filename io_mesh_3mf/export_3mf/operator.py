@@ -36,6 +36,7 @@ from .archive import create_archive
 from .components import collect_mesh_objects
 from .context import ExportContext, ExportOptions
 from .geometry import check_non_manifold_geometry
+from .materials import has_passthrough_materials
 from .orca import OrcaExporter
 from .prusa import PrusaExporter
 from .standard import StandardExporter
@@ -398,17 +399,7 @@ class Export3MF(bpy.types.Operator, bpy_extras.io_utils.ExportHelper):
                 # prior 3MF import.  If so, use StandardExporter to preserve
                 # round-trip fidelity (colorgroups, textures, multiproperties,
                 # etc.) instead of converting to Orca paint_color attributes.
-                scene = context.scene
-                has_passthrough = bool(
-                    scene.get("3mf_colorgroups")
-                    or scene.get("3mf_compositematerials")
-                    or scene.get("3mf_multiproperties")
-                    or scene.get("3mf_textures")
-                    or scene.get("3mf_texture_groups")
-                    or scene.get("3mf_pbr_display_props")
-                    or scene.get("3mf_pbr_texture_displays")
-                )
-                if has_passthrough:
+                if has_passthrough_materials(context.scene):
                     debug(
                         "Multi-material faces with passthrough data detected, "
                         "using Standard exporter for round-trip fidelity"
@@ -467,7 +458,12 @@ class Export3MF(bpy.types.Operator, bpy_extras.io_utils.ExportHelper):
         return name_to_index
 
     def write_vertices(self, mesh_element, vertices) -> None:
-        """Write vertices to mesh element. Backward-compatible wrapper."""
+        """
+        Write vertices to mesh element. Backward-compatible wrapper.
+
+        The coordinates are read in bulk with ``foreach_get``, so ``vertices`` must be the mesh's
+        vertex collection (``mesh.vertices``). A plain list of vertices is no longer accepted.
+        """
         from .geometry import write_vertices as _write_vertices
 
         _write_vertices(
@@ -483,7 +479,12 @@ class Export3MF(bpy.types.Operator, bpy_extras.io_utils.ExportHelper):
         mesh=None,
         blender_object=None,
     ) -> None:
-        """Write triangles to mesh element. Backward-compatible wrapper."""
+        """
+        Write triangles to mesh element. Backward-compatible wrapper.
+
+        The triangle data is read in bulk with ``foreach_get``, so ``triangles`` must be the mesh's
+        triangle collection (``mesh.loop_triangles``). A plain list of triangles is no longer accepted.
+        """
         from .geometry import write_triangles as _write_triangles
 
         _write_triangles(
@@ -49,9 +49,9 @@ from ..common.logging import debug, warn, error
 from ..common.xml import format_transformation
 
 from .materials import (
-    ORCA_FILAMENT_CODES,
+    ORCA_FILAMENT_CODE_MAP,
     collect_face_colors,
-    get_triangle_color,
+    get_slot_colors,
 )
 from .components import collect_mesh_objects
 from .segmentation import texture_to_segmentation
@@ -390,6 +390,13 @@ class OrcaExporter(BaseExporter):
                         traceback.print_exc()
                         segmentation_strings = {}
 
+        # A face's paint code only depends on its material slot, so resolve it once per slot
+        slot_paint_codes = []
+        for slot_color in get_slot_colors(blender_object, eval_object):
+            filament_index = ctx.vertex_colors.get(slot_color) if slot_color else None
+            slot_paint_codes.append(ORCA_FILAMENT_CODE_MAP.get(filament_index))
+        num_slots = len(slot_paint_codes)
+
         # Triangles with paint_color
         triangles_elem = xml.etree.ElementTree.SubElement(mesh_elem, "triangles")
         for tri_idx, triangle in enumerate(mesh.loop_triangles):
@@ -410,13 +417,11 @@ class OrcaExporter(BaseExporter):
                     continue
 
             # Fall back to simple paint_color from face material colors
-            triangle_color = get_triangle_color(mesh, triangle, blender_object, eval_object)
-            if triangle_color and triangle_color in ctx.vertex_colors:
-                filament_index = ctx.vertex_colors[triangle_color]
-                if filament_index < len(ORCA_FILAMENT_CODES):
-                    paint_code = ORCA_FILAMENT_CODES[filament_index]
-                    if paint_code:
-                        tri_attribs["paint_color"] = paint_code
+            material_index = triangle.material_index
+            if material_index < num_slots:
+                paint_code = slot_paint_codes[material_index]
+                if paint_code is not None:
+                    tri_attribs["paint_color"] = paint_code
 
             xml.etree.ElementTree.SubElement(
                 triangles_elem, "triangle", attrib=tri_attribs
@@ -431,12 +436,8 @@ class OrcaExporter(BaseExporter):
         # Write to archive
         archive_path = object_path.lstrip("/")
         document = xml.etree.ElementTree.ElementTree(root)
-        buffer = io.BytesIO()
-        document.write(buffer, xml_declaration=True, encoding="UTF-8")
-        xml_content = buffer.getvalue().decode("UTF-8")
-
-        with archive.open(archive_path, "w") as f:
-            f.write(xml_content.encode("UTF-8"))
+        with archive.open(archive_path, "w", force_zip64=True) as f:
+            document.write(f, xml_declaration=True, encoding="UTF-8")
 
         debug(f"Wrote object model: {archive_path}")
 
@@ -551,12 +552,8 @@ class OrcaExporter(BaseExporter):
 
         # Write to archive
         document = xml.etree.ElementTree.ElementTree(root)
-        buffer = io.BytesIO()
-        document.write(buffer, xml_declaration=True, encoding="UTF-8")
-        xml_content = buffer.getvalue().decode("UTF-8")
-
-        with archive.open(MODEL_LOCATION, "w") as f:
-            f.write(xml_content.encode("UTF-8"))
+        with archive.open(MODEL_LOCATION, "w", force_zip64=True) as f:
+            document.write(f, xml_declaration=True, encoding="UTF-8")
 
         debug(f"Wrote main model: {MODEL_LOCATION}")
 
@@ -579,13 +576,10 @@ class OrcaExporter(BaseExporter):
                 },
             )
 
-        document = xml.etree.ElementTree.ElementTree(root)
-        buffer = io.BytesIO()
-        document.write(buffer, xml_declaration=True, encoding="UTF-8")
-        xml_content = buffer.getvalue().decode("UTF-8")
-
-        with archive.open("3D/_rels/3dmodel.model.rels", "w") as f:
-            f.write(xml_content.encode("UTF-8"))
+        archive.writestr(
+            "3D/_rels/3dmodel.model.rels",
+            xml.etree.ElementTree.tostring(root, xml_declaration=True, encoding="UTF-8"),
+        )
 
         debug("Wrote 3D/_rels/3dmodel.model.rels")
 
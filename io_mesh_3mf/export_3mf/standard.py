@@ -40,7 +40,7 @@ from .components import collect_mesh_objects, detect_linked_duplicates, should_u
 from .geometry import write_vertices, write_triangles, write_passthrough_triangles, write_metadata
 from .materials import (
     write_materials,
-    get_triangle_color,
+    count_triangle_colors,
     detect_textured_materials,
     detect_pbr_textured_materials,
     write_textures_to_archive,
@@ -48,6 +48,7 @@ from .materials import (
     write_texture_resources,
     write_pbr_textures_to_archive,
     write_pbr_texture_display_properties,
+    read_passthrough_data,
     write_passthrough_materials,
     write_passthrough_textures_to_archive,
 )
@@ -57,6 +58,9 @@ from .triangle_sets import write_triangle_sets
 if TYPE_CHECKING:
     from .context import ExportContext
 
+# Built once; item and component transforms equal to it are omitted from the document
+_IDENTITY_MATRIX = mathutils.Matrix.Identity(4).freeze()
+
 
 class BaseExporter:
     """Base class for format-specific exporters."""
@@ -196,7 +200,8 @@ class StandardExporter(BaseExporter):
             debug(f"Created {len(ctx.texture_groups)} texture groups")
 
         # Write passthrough texture images to the archive BEFORE writing XML references
-        passthrough_image_paths = write_passthrough_textures_to_archive(archive)
+        ctx.passthrough_data = read_passthrough_data()
+        passthrough_image_paths = write_passthrough_textures_to_archive(archive, ctx.passthrough_data)
         if passthrough_image_paths:
             passthrough_rel_paths = {
                 path: f"/{path}" for path in passthrough_image_paths
@@ -205,7 +210,7 @@ class StandardExporter(BaseExporter):
 
         # Write passthrough materials (compositematerials, multiproperties, etc.)
         ctx.next_resource_id, passthrough_written, ctx.passthrough_id_remap = (
-            write_passthrough_materials(resources_element, ctx.next_resource_id)
+            write_passthrough_materials(resources_element, ctx.next_resource_id, ctx.passthrough_data)
         )
         if passthrough_written:
             ctx.extension_manager.activate(MATERIALS_EXTENSION.namespace)
@@ -327,7 +332,7 @@ class StandardExporter(BaseExporter):
             item_element.attrib[self.attr("objectid")] = str(objectid)
 
             mesh_transformation = transformation @ blender_object.matrix_world
-            if mesh_transformation != mathutils.Matrix.Identity(4):
+            if mesh_transformation != _IDENTITY_MATRIX:
                 item_element.attrib[self.attr("transform")] = format_transformation(
                     mesh_transformation
                 )
@@ -410,7 +415,7 @@ class StandardExporter(BaseExporter):
                     )
                     ctx.num_written += 1
                     component_element.attrib[self.attr("objectid")] = str(child_id)
-                    if child_transformation != mathutils.Matrix.Identity(4):
+                    if child_transformation != _IDENTITY_MATRIX:
                         component_element.attrib[self.attr("transform")] = (
                             format_transformation(child_transformation)
                         )
@@ -494,18 +499,7 @@ class StandardExporter(BaseExporter):
                     and ctx.vertex_colors
                     and ctx.options.mmu_slicer_format == "ORCA"
                 ):
-                    color_counts = {}
-                    for triangle in mesh.loop_triangles:
-                        triangle_color = get_triangle_color(mesh, triangle, blender_object)
-                        debug(
-                            f"  triangle {triangle.index}: material_index={triangle.material_index}, "
-                            f"color={triangle_color}"
-                        )
-                        if triangle_color and triangle_color in ctx.vertex_colors:
-                            color_counts[triangle_color] = (
-                                color_counts.get(triangle_color, 0) + 1
-                            )
-
+                    color_counts = count_triangle_colors(mesh, blender_object, ctx.vertex_colors)
                     debug(f"  color_counts: {color_counts}")
                     if color_counts:
                         most_common_color = max(color_counts, key=color_counts.get)
@@ -565,6 +559,7 @@ class StandardExporter(BaseExporter):
                 write_passthrough_triangles(
                     mesh_element, mesh, passthrough_pid, remapped_pid,
                     ctx.options.use_orca_format, ctx.options.coordinate_precision,
+                    ctx.passthrough_data,
                 )
             else:
                 write_triangles(
@@ -765,13 +760,7 @@ class StandardExporter(BaseExporter):
                 and ctx.vertex_colors
                 and ctx.options.mmu_slicer_format == "ORCA"
             ):
-                color_counts = {}
-                for triangle in mesh.loop_triangles:
-                    triangle_color = get_triangle_color(mesh, triangle, blender_object)
-                    if triangle_color and triangle_color in ctx.vertex_colors:
-                        color_counts[triangle_color] = (
-                            color_counts.get(triangle_color, 0) + 1
-                        )
+                color_counts = count_triangle_colors(mesh, blender_object, ctx.vertex_colors)
 
                 if color_counts:
                     most_common_color = max(color_counts, key=color_counts.get)
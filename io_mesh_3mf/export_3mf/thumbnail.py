@@ -22,12 +22,17 @@ Three modes:
 - **NONE** — Skips thumbnail generation entirely.
 
 The result is stored as ``Metadata/thumbnail.png`` inside the 3MF archive.
+
+Setting the environment variable ``BLENDER_3MF_SKIP_THUMBNAIL=1`` skips the
+thumbnail regardless of mode, which keeps scripted batch exports from paying
+for a viewport render per file.
 """
 
 from __future__ import annotations
 
 import math
 import os
+import shutil
 import tempfile
 import zipfile
 from typing import TYPE_CHECKING, List, Optional
@@ -35,11 +40,20 @@ from typing import TYPE_CHECKING, List, Optional
 import bpy
 import mathutils
 
+from ..common.images import PNG_SIGNATURE, read_image_source
 from ..common.logging import debug, warn
 
 if TYPE_CHECKING:
     from .context import ExportContext
 
+_THUMBNAIL_LOCATION = "Metadata/thumbnail.png"
+_SKIP_THUMBNAIL_VARIABLE = "BLENDER_3MF_SKIP_THUMBNAIL"
+
+# Blender only renders and saves images to a file path. Where a memory-backed
+# directory is available the temporary PNG goes there, so the round trip never
+# touches the disk; otherwise the system temp directory is used.
+_TEMP_DIR = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
 
 # ───────────────────────────────────────────────────────────────────────────
 # Public entry point
@@ -71,6 +85,9 @@ def write_thumbnail(
     if mode == "NONE":
         debug("Thumbnail generation disabled by user")
         return
+    if os.environ.get(_SKIP_THUMBNAIL_VARIABLE) == "1":
+        debug(f"Thumbnail generation disabled by {_SKIP_THUMBNAIL_VARIABLE}")
+        return
 
     try:
         if mode == "CUSTOM" and custom_path:
@@ -114,28 +131,60 @@ def _write_custom_thumbnail(
 
     tmp_path = ""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
-
-        img.file_format = "PNG"
-        img.save_render(tmp_path)
-
-        with open(tmp_path, "rb") as f:
-            png_data = f.read()
-
-        with archive.open("Metadata/thumbnail.png", "w") as f:
-            f.write(png_data)
+        # An unmodified PNG can be embedded as-is; anything else is converted through a temp file
+        png_data = read_image_source(img, PNG_SIGNATURE)
+        if png_data is None:
+            tmp_path = _temp_png_path()
+
+            img.file_format = "PNG"
+            img.save_render(tmp_path)
+            _write_png_file(archive, tmp_path)
+        else:
+            # PNG data is already deflated; store it rather than compressing it a second time
+            archive.writestr(_THUMBNAIL_LOCATION, png_data, compress_type=zipfile.ZIP_STORED)
 
         debug(f"Wrote custom thumbnail from '{img.name}'")
     finally:
         # Only remove images we loaded ourselves (not user data).
         if loaded:
             bpy.data.images.remove(img)
-        if tmp_path:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+        _remove_temp_file(tmp_path)
+
+
+def _temp_png_path() -> str:
+    """Reserve a temporary ``.png`` path for Blender to render or save into.
+
+    The file is created with ``mkstemp`` and its descriptor closed right
+    away: Blender writes the image itself by path, so no Python file object
+    is needed.
+    """
+    handle, path = tempfile.mkstemp(suffix=".png", dir=_TEMP_DIR)
+    os.close(handle)
+    return path
+
+
+def _remove_temp_file(path: str) -> None:
+    """Delete a temporary file from :func:`_temp_png_path`, if one was made."""
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _write_png_file(archive: zipfile.ZipFile, png_path: str) -> None:
+    """Copy a PNG file on disk into the archive as the thumbnail.
+
+    The file is streamed into an uncompressed entry; PNG data is already
+    deflated, so compressing it again would only cost time.
+
+    :param archive: Open 3MF ZIP archive.
+    :param png_path: Path of the PNG file to copy.
+    """
+    zip_info = zipfile.ZipInfo.from_file(png_path, _THUMBNAIL_LOCATION)
+    zip_info.compress_type = zipfile.ZIP_STORED
+    with open(png_path, "rb") as source, archive.open(zip_info, "w") as target:
+        shutil.copyfileobj(source, target)
 
 
 # ───────────────────────────────────────────────────────────────────────────
@@ -158,32 +207,24 @@ def _write_auto_thumbnail(
         return
 
     # Find a 3D viewport ---------------------------------------------------
-    view3d_area = None
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == "VIEW_3D":
-                view3d_area = area
-                break
-        if view3d_area:
-            break
-
+    view3d_area = next(
+        (
+            area
+            for window in bpy.context.window_manager.windows
+            for area in window.screen.areas
+            if area.type == "VIEW_3D"
+        ),
+        None,
+    )
     if not view3d_area:
         debug("No 3D viewport found for thumbnail generation")
         return
 
-    region = None
-    for r in view3d_area.regions:
-        if r.type == "WINDOW":
-            region = r
-            break
+    region = next((r for r in view3d_area.regions if r.type == "WINDOW"), None)
     if not region:
         return
 
-    space = None
-    for s in view3d_area.spaces:
-        if s.type == "VIEW_3D":
-            space = s
-            break
+    space = next((s for s in view3d_area.spaces if s.type == "VIEW_3D"), None)
     if not space:
         return
 
@@ -213,21 +254,27 @@ def _write_auto_thumbnail(
     rot_quat = direction.to_track_quat("-Z", "Y")
 
     # Save / override viewport state ----------------------------------------
-    orig_view_type = space.region_3d.view_perspective
-    orig_view_location = space.region_3d.view_location.copy()
-    orig_view_rotation = space.region_3d.view_rotation.copy()
-    orig_view_distance = space.region_3d.view_distance
-
-    orig_show_overlays = space.overlay.show_overlays
+    region_3d = space.region_3d
+    overlay = space.overlay
+    orig_view = (
+        region_3d.view_perspective,
+        region_3d.view_location.copy(),
+        region_3d.view_rotation.copy(),
+        region_3d.view_distance,
+    )
+    orig_show_overlays = overlay.show_overlays
     orig_show_gizmo = space.show_gizmo
 
     scene = bpy.context.scene
-    orig_res_x = scene.render.resolution_x
-    orig_res_y = scene.render.resolution_y
-    orig_res_pct = scene.render.resolution_percentage
-    orig_format = scene.render.image_settings.file_format
-    orig_filepath = scene.render.filepath
-    orig_alpha_mode = scene.render.image_settings.color_mode
+    render = scene.render
+    image_settings = render.image_settings
+    orig_render = (
+        render.resolution_x,
+        render.resolution_y,
+        render.resolution_percentage,
+        render.filepath,
+    )
+    orig_image = (image_settings.file_format, image_settings.color_mode)
 
     # Temporarily hide all objects NOT in the export set so only the
     # exported meshes appear in the thumbnail (no reference spheres,
@@ -243,26 +290,24 @@ def _write_auto_thumbnail(
     tmp_path = ""
     try:
         # Set viewport to our computed camera angle -------------------------
-        space.region_3d.view_perspective = "PERSP"
-        space.region_3d.view_location = center
-        space.region_3d.view_rotation = rot_quat
-        space.region_3d.view_distance = distance
+        region_3d.view_perspective = "PERSP"
+        region_3d.view_location = center
+        region_3d.view_rotation = rot_quat
+        region_3d.view_distance = distance
 
         # Disable all overlays (grid, floor, axes, cursor, origins,
         # reference spheres, extras, annotations — everything).
-        space.overlay.show_overlays = False
+        overlay.show_overlays = False
         space.show_gizmo = False
 
         # Render settings ---------------------------------------------------
-        scene.render.resolution_x = resolution
-        scene.render.resolution_y = resolution
-        scene.render.resolution_percentage = 100
-        scene.render.image_settings.file_format = "PNG"
-        scene.render.image_settings.color_mode = "RGBA"
-
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
-        scene.render.filepath = tmp_path
+        tmp_path = _temp_png_path()
+        render.resolution_x = resolution
+        render.resolution_y = resolution
+        render.resolution_percentage = 100
+        render.filepath = tmp_path
+        image_settings.file_format = "PNG"
+        image_settings.color_mode = "RGBA"
 
         # Render OpenGL viewport capture ------------------------------------
         override = bpy.context.copy()
@@ -273,40 +318,35 @@ def _write_auto_thumbnail(
             bpy.ops.render.opengl(write_still=True)
 
         # Write to archive --------------------------------------------------
-        with open(tmp_path, "rb") as f:
-            png_data = f.read()
-
-        with archive.open("Metadata/thumbnail.png", "w") as f:
-            f.write(png_data)
+        _write_png_file(archive, tmp_path)
 
         debug(f"Wrote thumbnail.png ({resolution}x{resolution}) from auto render")
 
     finally:
         # Restore everything ------------------------------------------------
-        space.region_3d.view_perspective = orig_view_type
-        space.region_3d.view_location = orig_view_location
-        space.region_3d.view_rotation = orig_view_rotation
-        space.region_3d.view_distance = orig_view_distance
-
-        space.overlay.show_overlays = orig_show_overlays
+        (
+            region_3d.view_perspective,
+            region_3d.view_location,
+            region_3d.view_rotation,
+            region_3d.view_distance,
+        ) = orig_view
+
+        overlay.show_overlays = orig_show_overlays
         space.show_gizmo = orig_show_gizmo
 
-        scene.render.resolution_x = orig_res_x
-        scene.render.resolution_y = orig_res_y
-        scene.render.resolution_percentage = orig_res_pct
-        scene.render.image_settings.file_format = orig_format
-        scene.render.image_settings.color_mode = orig_alpha_mode
-        scene.render.filepath = orig_filepath
+        (
+            render.resolution_x,
+            render.resolution_y,
+            render.resolution_percentage,
+            render.filepath,
+        ) = orig_render
+        image_settings.file_format, image_settings.color_mode = orig_image
 
         # Unhide objects that were temporarily hidden -------------------
         for obj in hidden_objects:
             obj.hide_set(False)
 
-        if tmp_path:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+        _remove_temp_file(tmp_path)
 
 
 # ───────────────────────────────────────────────────────────────────────────
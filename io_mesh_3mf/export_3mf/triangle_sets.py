@@ -19,13 +19,23 @@ to 3MF Triangle Sets Extension format.
 """
 
 import xml.etree.ElementTree
-from typing import Dict, List
 
 import bpy
+import numpy as np
 
 from ..common.constants import TRIANGLE_SETS_NAMESPACE
+from ..common.extensions import TRIANGLE_SETS_EXTENSION
 from ..common.logging import debug, warn
 
+# Register the triangle sets prefix once so serialization never has to invent ns0-style prefixes.
+xml.etree.ElementTree.register_namespace(TRIANGLE_SETS_EXTENSION.prefix, TRIANGLE_SETS_NAMESPACE)
+
+# Qualified element names, built once rather than per written element.
+_TRIANGLESETS = f"{{{TRIANGLE_SETS_NAMESPACE}}}trianglesets"
+_TRIANGLESET = f"{{{TRIANGLE_SETS_NAMESPACE}}}triangleset"
+_REFRANGE = f"{{{TRIANGLE_SETS_NAMESPACE}}}refrange"
+_REF = f"{{{TRIANGLE_SETS_NAMESPACE}}}ref"
+
 
 def write_triangle_sets(
     mesh_element: xml.etree.ElementTree.Element, mesh: bpy.types.Mesh
@@ -58,63 +68,60 @@ def write_triangle_sets(
         )
         return
 
-    # Build mapping of set_index -> list of triangle indices
+    # Read all set indices in one call; 0 means the face is in no set
     num_faces = len(mesh.polygons)
-    set_values = [0] * num_faces
+    set_values = np.empty(num_faces, dtype=np.int32)
     mesh.attributes[attr_name].data.foreach_get("value", set_values)
 
-    # Group triangles by set index
-    set_to_triangles: Dict[int, List[int]] = {}
-    for poly_idx, set_idx in enumerate(set_values):
-        if set_idx > 0:
-            if set_idx not in set_to_triangles:
-                set_to_triangles[set_idx] = []
-            set_to_triangles[set_idx].append(poly_idx)
-
-    if not set_to_triangles:
+    face_indices = np.flatnonzero(set_values > 0)
+    if len(face_indices) == 0:
         return
 
-    trianglesets_element = xml.etree.ElementTree.SubElement(
-        mesh_element, f"{{{TRIANGLE_SETS_NAMESPACE}}}trianglesets"
+    # Group faces by set with one stable sort; faces stay in ascending order within each set
+    set_keys = set_values[face_indices]
+    order = np.argsort(set_keys, kind="stable")
+    set_keys = set_keys[order]
+    face_indices = face_indices[order]
+
+    # Find every run of consecutive faces in one pass over all sets: a run ends where
+    # the set changes or the next face index is not adjacent
+    run_breaks = np.flatnonzero((np.diff(set_keys) != 0) | (np.diff(face_indices) != 1)) + 1
+    run_first = np.r_[0, run_breaks]
+    run_last = np.r_[run_breaks - 1, len(face_indices) - 1]
+    run_starts = face_indices[run_first].tolist()
+    run_ends = face_indices[run_last].tolist()
+
+    set_indices, set_sizes = np.unique(set_keys, return_counts=True)
+    set_run_bounds = np.searchsorted(set_keys[run_first], set_indices).tolist() + [len(run_starts)]
+
+    sub_element = xml.etree.ElementTree.SubElement  # Local binding for the per-run loop
+    trianglesets_element = sub_element(
+        mesh_element, _TRIANGLESETS
     )
 
-    for set_idx, triangle_indices in sorted(set_to_triangles.items()):
+    for set_position, (set_idx, set_size) in enumerate(zip(set_indices.tolist(), set_sizes.tolist())):
         if set_idx <= len(set_names):
             set_name = str(set_names[set_idx - 1])
         else:
             set_name = f"TriangleSet_{set_idx}"
 
-        triangleset_element = xml.etree.ElementTree.SubElement(
-            trianglesets_element, f"{{{TRIANGLE_SETS_NAMESPACE}}}triangleset"
+        triangleset_element = sub_element(
+            trianglesets_element, _TRIANGLESET, attrib={"name": set_name, "identifier": set_name}
         )
-        triangleset_element.attrib["name"] = set_name
-        triangleset_element.attrib["identifier"] = set_name
 
-        triangle_indices = sorted(triangle_indices)
+        first_run = set_run_bounds[set_position]
+        last_run = set_run_bounds[set_position + 1]
 
         # Use refrange for consecutive sequences, ref for isolated indices
-        i = 0
-        while i < len(triangle_indices):
-            start = triangle_indices[i]
-            end = start
-            while i + 1 < len(triangle_indices) and triangle_indices[i + 1] == end + 1:
-                i += 1
-                end = triangle_indices[i]
-
+        for start, end in zip(run_starts[first_run:last_run], run_ends[first_run:last_run]):
             if end - start >= 2:
-                refrange_element = xml.etree.ElementTree.SubElement(
-                    triangleset_element, f"{{{TRIANGLE_SETS_NAMESPACE}}}refrange"
+                sub_element(
+                    triangleset_element, _REFRANGE, attrib={"startindex": str(start), "endindex": str(end)}
                 )
-                refrange_element.attrib["startindex"] = str(start)
-                refrange_element.attrib["endindex"] = str(end)
             else:
                 for idx in range(start, end + 1):
-                    ref_element = xml.etree.ElementTree.SubElement(
-                        triangleset_element, f"{{{TRIANGLE_SETS_NAMESPACE}}}ref"
-                    )
-                    ref_element.attrib["index"] = str(idx)
-            i += 1
+                    sub_element(triangleset_element, _REF, attrib={"index": str(idx)})
 
         debug(
-            f"Exported triangle set '{set_name}' with {len(triangle_indices)} triangles"
+            f"Exported triangle set '{set_name}' with {set_size} triangles"
         )
@@ -18,7 +18,6 @@ Handles opening ZIP archives, parsing ``[Content_Types].xml``, assigning
 MIME types to archive entries, and preserving ``MustPreserve`` files.
 """
 
-import base64
 import re
 import xml.etree.ElementTree
 import zipfile
@@ -36,6 +35,7 @@ from ..common import (
     conflicting_mustpreserve_contents,
 )
 from ..common.annotations import Annotations, ContentType, Relationship
+from ..common.preserved import PRESERVED_BASE64_MARKER, decode_preserved, encode_preserved
 
 if TYPE_CHECKING:
     from .context import ImportContext
@@ -202,7 +202,7 @@ def must_preserve(
 ) -> None:
     """Preserve ``MustPreserve`` and ``PrintTicket`` files in Blender text blocks.
 
-    Archived files are stored in Base85 encoding so that arbitrary binary data
+    Archived files are stored in Base64 encoding so that arbitrary binary data
     can round-trip through Blender's Text objects.
 
     :param ctx: The import context (unused currently, reserved for future reporting).
@@ -230,14 +230,21 @@ def must_preserve(
                 if filename in bpy.data.texts:
                     if bpy.data.texts[filename].as_string() == conflicting_mustpreserve_contents:
                         continue
-                file_contents = base64.b85encode(file.read()).decode("UTF-8")
+                file_data = file.read()
+                file_contents = encode_preserved(file_data)
                 if filename in bpy.data.texts:
-                    if bpy.data.texts[filename].as_string() == file_contents:
-                        continue
-                    else:
-                        bpy.data.texts[filename].clear()
-                        bpy.data.texts[filename].write(conflicting_mustpreserve_contents)
+                    existing_contents = bpy.data.texts[filename].as_string()
+                    if existing_contents == file_contents:
                         continue
+                    if not existing_contents.startswith(PRESERVED_BASE64_MARKER):
+                        try:
+                            if decode_preserved(existing_contents) == file_data:
+                                continue  # Same file, stored by an older version in Base85.
+                        except ValueError:
+                            pass  # Not Base85 either, so it can't be the same file.
+                    bpy.data.texts[filename].clear()
+                    bpy.data.texts[filename].write(conflicting_mustpreserve_contents)
+                    continue
                 else:
                     handle = bpy.data.texts.new(filename)
                     handle.write(file_contents)
@@ -32,6 +32,10 @@ from ...common.types import (
     ResourceMultiproperties,
 )
 
+# Separators without padding spaces keep the stored blobs small, which also makes
+# parsing them again on every export cheaper.
+_COMPACT_JSON = (",", ":")
+
 
 def read_composite_materials(op, root, material_ns: Dict[str, str]) -> None:
     """
@@ -156,7 +160,7 @@ def store_passthrough_materials(op) -> None:
                 "colors": cg.colors,
                 "displaypropertiesid": cg.displaypropertiesid,
             }
-        scene["3mf_colorgroups"] = json.dumps(colorgroups_data)
+        scene["3mf_colorgroups"] = json.dumps(colorgroups_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(colorgroups_data)} colorgroups for round-trip export")
 
     # Store composite materials
@@ -169,7 +173,7 @@ def store_passthrough_materials(op) -> None:
                 "displaypropertiesid": comp.displaypropertiesid,
                 "composites": comp.composites,
             }
-        scene["3mf_compositematerials"] = json.dumps(composites_data)
+        scene["3mf_compositematerials"] = json.dumps(composites_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(composites_data)} compositematerials for round-trip export")
 
     # Store multiproperties
@@ -181,7 +185,7 @@ def store_passthrough_materials(op) -> None:
                 "blendmethods": mp.blendmethods,
                 "multis": mp.multis,
             }
-        scene["3mf_multiproperties"] = json.dumps(multiprops_data)
+        scene["3mf_multiproperties"] = json.dumps(multiprops_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(multiprops_data)} multiproperties for round-trip export")
 
     # Store texture metadata
@@ -196,7 +200,7 @@ def store_passthrough_materials(op) -> None:
                 "filter": tex.filter,
                 "blender_image": tex.blender_image.name if tex.blender_image else None,
             }
-        scene["3mf_textures"] = json.dumps(textures_data)
+        scene["3mf_textures"] = json.dumps(textures_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(textures_data)} texture2d resources for round-trip export")
 
     # Store texture groups
@@ -208,7 +212,7 @@ def store_passthrough_materials(op) -> None:
                 "tex2coords": group.tex2coords,
                 "displaypropertiesid": group.displaypropertiesid,
             }
-        scene["3mf_texture_groups"] = json.dumps(groups_data)
+        scene["3mf_texture_groups"] = json.dumps(groups_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(groups_data)} texture2dgroup resources for round-trip export")
 
     # Store non-textured PBR display properties
@@ -216,7 +220,7 @@ def store_passthrough_materials(op) -> None:
         pbr_data = {}
         for props_id, props in op.resource_pbr_display_props.items():
             pbr_data[props_id] = {"type": props.type, "properties": props.properties}
-        scene["3mf_pbr_display_props"] = json.dumps(pbr_data)
+        scene["3mf_pbr_display_props"] = json.dumps(pbr_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(pbr_data)} PBR display properties for round-trip export")
 
     # Store textured PBR display properties
@@ -231,5 +235,5 @@ def store_passthrough_materials(op) -> None:
                 "basecolor_texid": props.basecolor_texid,
                 "factors": props.factors,
             }
-        scene["3mf_pbr_texture_displays"] = json.dumps(tex_pbr_data)
+        scene["3mf_pbr_texture_displays"] = json.dumps(tex_pbr_data, separators=_COMPACT_JSON)
         debug(f"Stored {len(tex_pbr_data)} textured PBR display properties for round-trip export")
@@ -5,6 +5,7 @@ Covers export functionality without mocking.
 """
 
 import bpy
+import json
 import unittest
 import zipfile
 import xml.etree.ElementTree as ET
@@ -306,6 +307,128 @@ class ExportMaterialTests(Blender3mfTestCase):
         self.assertIn('FINISHED', result)
         self.assertTrue(self.temp_file.exists())
 
+    def test_read_principled_values(self):
+        """Principled BSDF inputs are read directly from the node tree."""
+        from io_mesh_3mf.export_3mf.materials import material_to_hex_color, read_principled_values
+
+        mat = self.create_red_material()
+        principled = mat.node_tree.nodes.get("Principled BSDF")
+        principled.inputs["Metallic"].default_value = 0.75
+        principled.inputs["Transmission Weight"].default_value = 0.25
+
+        values = read_principled_values(mat)
+        self.assertAlmostEqual(values.base_color[0], 1.0)
+        self.assertAlmostEqual(values.metallic, 0.75)
+        self.assertAlmostEqual(values.transmission, 0.25)
+        self.assertEqual(material_to_hex_color(mat), "#FF0000")
+
+    def test_read_principled_values_uses_output_surface(self):
+        """The Principled node linked to the material output wins over other Principled nodes."""
+        from io_mesh_3mf.export_3mf.materials import material_to_hex_color, read_principled_values
+
+        mat = self.create_red_material()
+        tree = mat.node_tree
+        linked = tree.nodes.new("ShaderNodeBsdfPrincipled")
+        linked.inputs["Base Color"].default_value = (0.0, 0.0, 1.0, 1.0)
+        linked.inputs["Metallic"].default_value = 1.0
+        output = tree.nodes.get("Material Output")
+        tree.links.new(linked.outputs["BSDF"], output.inputs["Surface"])
+
+        values = read_principled_values(mat)
+        self.assertAlmostEqual(values.metallic, 1.0)
+        self.assertEqual(material_to_hex_color(mat), "#0000FF")
+
+    def test_texture_detection_uses_output_surface(self):
+        """Textures are read from the same Principled node as the material's colors."""
+        from io_mesh_3mf.export_3mf.materials import detect_textured_materials
+
+        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 0))
+        cube = bpy.context.object
+        mat = self.create_red_material()
+        cube.data.materials.append(mat)
+
+        tree = mat.node_tree
+        leftover_texture = tree.nodes.new("ShaderNodeTexImage")
+        leftover_texture.image = bpy.data.images.new("LeftoverImage", width=4, height=4)
+        tree.links.new(leftover_texture.outputs["Color"], tree.nodes.get("Principled BSDF").inputs["Base Color"])
+
+        linked = tree.nodes.new("ShaderNodeBsdfPrincipled")
+        linked_texture = tree.nodes.new("ShaderNodeTexImage")
+        linked_texture.image = bpy.data.images.new("LinkedImage", width=4, height=4)
+        tree.links.new(linked_texture.outputs["Color"], linked.inputs["Base Color"])
+        tree.links.new(linked.outputs["BSDF"], tree.nodes.get("Material Output").inputs["Surface"])
+
+        textured = detect_textured_materials([cube])
+        self.assertEqual(textured[mat.name]["image"].name, "LinkedImage")
+
+    def test_read_principled_values_behind_mix_shader(self):
+        """A Principled node behind another shader is not read; viewport settings are used instead."""
+        from io_mesh_3mf.export_3mf.materials import material_to_hex_color, read_principled_values
+
+        mat = self.create_red_material()
+        mat.diffuse_color = (0.0, 1.0, 0.0, 1.0)
+        mat.metallic = 0.25
+        tree = mat.node_tree
+        principled = tree.nodes.get("Principled BSDF")
+        principled.inputs["Metallic"].default_value = 1.0
+        mix = tree.nodes.new("ShaderNodeMixShader")
+        tree.links.new(principled.outputs["BSDF"], mix.inputs[1])
+        tree.links.new(mix.outputs["Shader"], tree.nodes.get("Material Output").inputs["Surface"])
+
+        values = read_principled_values(mat)
+        self.assertAlmostEqual(values.metallic, 0.25)
+        self.assertEqual(values.alpha, 1.0)
+        self.assertEqual(material_to_hex_color(mat), "#00FF00")
+
+    def test_read_principled_values_unlinked_output(self):
+        """With nothing linked to the output, the first Principled node is read."""
+        from io_mesh_3mf.export_3mf.materials import material_to_hex_color, read_principled_values
+
+        mat = self.create_red_material()
+        tree = mat.node_tree
+        principled = tree.nodes.get("Principled BSDF")
+        principled.inputs["Metallic"].default_value = 0.5
+        for link in list(tree.nodes.get("Material Output").inputs["Surface"].links):
+            tree.links.remove(link)
+
+        values = read_principled_values(mat)
+        self.assertAlmostEqual(values.metallic, 0.5)
+        self.assertEqual(material_to_hex_color(mat), "#FF0000")
+
+    def test_read_principled_values_without_nodes(self):
+        """Materials without a node tree fall back to their viewport settings."""
+        from io_mesh_3mf.export_3mf.materials import material_to_hex_color, read_principled_values
+
+        mat = bpy.data.materials.new(name="PlainMaterial")
+        mat.use_nodes = False
+        mat.diffuse_color = (0.0, 1.0, 0.0, 1.0)
+        mat.metallic = 0.5
+
+        values = read_principled_values(mat)
+        self.assertAlmostEqual(values.metallic, 0.5)
+        self.assertEqual(values.alpha, 1.0)
+        self.assertEqual(material_to_hex_color(mat), "#00FF00")
+
+    def test_slot_colors_and_triangle_counts(self):
+        """Slot colors are resolved per slot and triangles counted per color."""
+        from io_mesh_3mf.export_3mf.materials import count_triangle_colors, get_slot_colors
+
+        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 0))
+        cube = bpy.context.object
+        cube.data.materials.append(self.create_red_material())
+        cube.data.materials.append(self.create_blue_material())
+        cube.data.materials.append(None)
+        for polygon in cube.data.polygons:
+            polygon.material_index = 1 if polygon.index < 2 else 0
+
+        self.assertEqual(get_slot_colors(cube), ["#FF0000", "#0000FF", None])
+
+        mesh = cube.data
+        mesh.calc_loop_triangles()
+        color_counts = count_triangle_colors(mesh, cube, {"#FF0000": 1, "#0000FF": 2})
+        self.assertEqual(color_counts, {"#0000FF": 4, "#FF0000": 8})
+        self.assertEqual(list(color_counts), ["#0000FF", "#FF0000"])
+
 
 class ExportArchiveTests(Blender3mfTestCase):
     """Tests verifying 3MF archive structure."""
@@ -370,6 +493,121 @@ class ExportArchiveTests(Blender3mfTestCase):
             # Cube has 12 triangles
             self.assertGreaterEqual(len(triangles), 12)
 
+    def test_core_properties(self):
+        """Verify docProps/core.xml is well-formed and carries both timestamps."""
+        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 0))
+        bpy.ops.export_mesh.threemf(filepath=str(self.temp_file))
+
+        with zipfile.ZipFile(self.temp_file, 'r') as archive:
+            root = ET.fromstring(archive.read('docProps/core.xml'))
+
+            ns = {'dc': 'http://purl.org/dc/elements/1.1/', 'dcterms': 'http://purl.org/dc/terms/'}
+            self.assertEqual(root.find('dc:creator', ns).text, 'Blender 3MF Format Add-on')
+            created = root.find('dcterms:created', ns).text
+            self.assertRegex(created, r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$')
+            self.assertEqual(root.find('dcterms:modified', ns).text, created)
+
+
+class ExportTriangleSetTests(Blender3mfTestCase):
+    """Triangle sets extension export tests."""
+
+    def test_export_triangle_set_runs(self):
+        """Consecutive triangles become refranges, short runs become refs."""
+        # A strip of 8 triangles: faces 0-3 in set 1, 5-6 in set 1, 7 in set 2
+        verts = [(x, y, 0) for x in range(5) for y in range(2)]
+        faces = []
+        for x in range(4):
+            a, b, c, d = x * 2, x * 2 + 1, x * 2 + 3, x * 2 + 2
+            faces.append((a, b, c))
+            faces.append((a, c, d))
+        mesh = bpy.data.meshes.new("SetMesh")
+        mesh.from_pydata(verts, [], faces)
+        obj = bpy.data.objects.new("SetObject", mesh)
+        bpy.context.collection.objects.link(obj)
+
+        attr = mesh.attributes.new("3mf_triangle_set", 'INT', 'FACE')
+        attr.data.foreach_set("value", [1, 1, 1, 1, 0, 1, 1, 2])
+        mesh["3mf_triangle_set_names"] = ["First", "Second"]
+
+        bpy.ops.export_mesh.threemf(filepath=str(self.temp_file))
+
+        with zipfile.ZipFile(self.temp_file, 'r') as archive:
+            root = ET.fromstring(archive.read('3D/3dmodel.model'))
+
+        ns = {'t': 'http://schemas.microsoft.com/3dmanufacturing/trianglesets/2021/07'}
+        sets = root.findall('.//t:triangleset', ns)
+        self.assertEqual([s.get('name') for s in sets], ["First", "Second"])
+
+        first = [(child.tag.split('}')[1], dict(child.attrib)) for child in sets[0]]
+        self.assertEqual(first, [
+            ('refrange', {'startindex': '0', 'endindex': '3'}),
+            ('ref', {'index': '5'}),
+            ('ref', {'index': '6'}),
+        ])
+        second = [(child.tag.split('}')[1], dict(child.attrib)) for child in sets[1]]
+        self.assertEqual(second, [('ref', {'index': '7'})])
+
+
+class ExportPassthroughTests(Blender3mfTestCase):
+    """Round-trip export of stored Materials Extension resources."""
+
+    def test_export_passthrough_materials(self):
+        """Stored colorgroups, composites and multiproperties are written with remapped IDs."""
+        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 0))
+        cube = bpy.context.object
+        cube.data.materials.append(self.create_red_material())
+
+        # ID 1 collides with the basematerials written for the red material
+        scene = bpy.context.scene
+        scene["3mf_colorgroups"] = json.dumps({
+            "1": {"colors": ["#FF0000FF", "#00FF00FF"]},
+        })
+        scene["3mf_compositematerials"] = json.dumps({
+            "2": {"matid": "1", "matindices": "0 1", "composites": [{"values": "0.25 0.75"}]},
+        })
+        scene["3mf_multiproperties"] = json.dumps({
+            "3": {"pids": "1 2", "blendmethods": "mix", "multis": [{"pindices": "0 0"}, {"pindices": "1 0"}]},
+        })
+
+        result = bpy.ops.export_mesh.threemf(filepath=str(self.temp_file))
+        self.assertIn('FINISHED', result)
+
+        with zipfile.ZipFile(self.temp_file, 'r') as archive:
+            root = ET.fromstring(archive.read('3D/3dmodel.model'))
+
+        ns = {
+            'c': 'http://schemas.microsoft.com/3dmanufacturing/core/2015/02',
+            'm': 'http://schemas.microsoft.com/3dmanufacturing/material/2015/02',
+        }
+        basematerials = root.findall('.//c:basematerials', ns)
+        self.assertEqual(len(basematerials), 1)
+        base_id = basematerials[0].get('id')
+
+        colorgroups = root.findall('.//m:colorgroup', ns)
+        self.assertEqual(len(colorgroups), 1)
+        colorgroup_id = colorgroups[0].get('id')
+        self.assertNotEqual(colorgroup_id, base_id)
+        self.assertEqual(
+            [c.get('color') for c in colorgroups[0].findall('m:color', ns)], ["#FF0000FF", "#00FF00FF"]
+        )
+
+        composites = root.findall('.//m:compositematerials', ns)
+        self.assertEqual(len(composites), 1)
+        composite_id = composites[0].get('id')
+        self.assertNotEqual(composite_id, base_id)
+        self.assertEqual(composites[0].get('matid'), colorgroup_id)
+        self.assertEqual([c.get('values') for c in composites[0].findall('m:composite', ns)], ["0.25 0.75"])
+
+        multiproperties = root.findall('.//m:multiproperties', ns)
+        self.assertEqual(len(multiproperties), 1)
+        self.assertEqual(multiproperties[0].get('pids'), f"{colorgroup_id} {composite_id}")
+        self.assertEqual(multiproperties[0].get('blendmethods'), "mix")
+        self.assertEqual([m.get('pindices') for m in multiproperties[0].findall('c:multi', ns)], ["0 0", "1 0"])
+
+        # Every resource ID in the document stays unique after remapping
+        resource_ids = [element.get('id') for element in root.find('c:resources', ns)]
+        self.assertEqual(len(resource_ids), len(set(resource_ids)))
+
 
 class ExportEdgeCaseTests(Blender3mfTestCase):
     """Edge case and error handling tests."""
@@ -611,6 +611,75 @@ class TestTexture2D(MaterialsExtensionTestCase):
                         "Tex2coord count mismatch")
 
 
+    def _textured_material(self, name, image):
+        """Create a material whose Principled Base Color is driven by an Image Texture node."""
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        tree = mat.node_tree
+        tex_node = tree.nodes.new("ShaderNodeTexImage")
+        tex_node.image = image
+        tree.links.new(tex_node.outputs["Color"], tree.nodes.get("Principled BSDF").inputs["Base Color"])
+        return mat, tex_node
+
+    def test_packed_png_texture_embedded_unchanged(self):
+        """An unmodified packed PNG is copied into the archive byte for byte and stored uncompressed."""
+        png_path = get_temp_test_dir() / "packed_texture.png"
+        png_path.write_bytes(MINIMAL_PNG)
+        image = bpy.data.images.load(str(png_path))
+        image.pack()
+
+        bpy.ops.mesh.primitive_cube_add()
+        mat, _ = self._textured_material("PackedTexture", image)
+        bpy.context.object.data.materials.append(mat)
+
+        output_path = get_temp_test_dir() / "packed_texture_out.3mf"
+        self.assertTrue(self.export_3mf(output_path), "Export failed")
+
+        textures = self.find_elements(self.extract_model_xml(output_path), 'texture2d')
+        self.assertEqual(len(textures), 1)
+        archive_path = textures[0].get('path').lstrip('/')
+        with zipfile.ZipFile(output_path, 'r') as archive:
+            self.assertEqual(archive.read(archive_path), MINIMAL_PNG)
+            self.assertEqual(archive.getinfo(archive_path).compress_type, zipfile.ZIP_STORED)
+
+    def test_texture2d_shared_only_for_matching_sampling(self):
+        """Materials on one image share a texture2d only when tile style and filter match."""
+        png_path = get_temp_test_dir() / "shared_texture.png"
+        png_path.write_bytes(MINIMAL_PNG)
+        image = bpy.data.images.load(str(png_path))
+
+        clamped, clamped_node = self._textured_material("Clamped", image)
+        clamped_node.extension = "CLIP"
+        clamped_twin, clamped_twin_node = self._textured_material("ClampedTwin", image)
+        clamped_twin_node.extension = "CLIP"
+        nearest, nearest_node = self._textured_material("Nearest", image)
+        nearest_node.interpolation = "Closest"
+
+        for index, mat in enumerate((clamped, clamped_twin, nearest)):
+            bpy.ops.mesh.primitive_cube_add(location=(index * 3, 0, 0))
+            bpy.context.object.data.materials.append(mat)
+
+        output_path = get_temp_test_dir() / "texture2d_sampling_out.3mf"
+        self.assertTrue(self.export_3mf(output_path), "Export failed")
+
+        exported = self.extract_model_xml(output_path)
+        textures = {elem.get('id'): self.get_element_attribs(elem) for elem in self.find_elements(exported, 'texture2d')}
+        self.assertEqual(len(textures), 2)
+        self.assertEqual(len({attrs['path'] for attrs in textures.values()}), 1)
+
+        # Spec defaults (wrap, auto) may be left out of the written attributes
+        sampling = sorted(
+            (attrs.get('tilestyleu', 'wrap'), attrs.get('tilestylev', 'wrap'), attrs.get('filter', 'auto'))
+            for attrs in textures.values()
+        )
+        self.assertEqual(sampling, [("clamp", "clamp", "auto"), ("wrap", "wrap", "nearest")])
+
+        # Each texture2dgroup points at the texture2d with its material's settings
+        group_textures = [textures[group.get('texid')] for group in self.find_elements(exported, 'texture2dgroup')]
+        self.assertEqual(len(group_textures), 3)
+        self.assertEqual(sum(1 for attrs in group_textures if attrs.get('tilestyleu') == "clamp"), 2)
+        self.assertEqual(sum(1 for attrs in group_textures if attrs.get('filter') == "nearest"), 1)
+
 # =============================================================================
 # Test: Compositematerials (Passthrough)
 # =============================================================================
@@ -129,6 +129,25 @@ class TestThumbnailAPI(Blender3mfTestCase):
         self.assertEqual(result.status, "FINISHED")
         self.assertTrue(_has_thumbnail(str(self.temp_file)))
 
+    def test_api_skip_thumbnail_environment_variable(self):
+        """API: BLENDER_3MF_SKIP_THUMBNAIL=1 suppresses even a CUSTOM thumbnail."""
+        bpy.ops.mesh.primitive_cube_add()
+
+        img = bpy.data.images.new("SkipThumbTest", width=16, height=16)
+        img.pixels[:] = [1.0, 1.0, 0.0, 1.0] * (16 * 16)  # solid yellow
+
+        os.environ["BLENDER_3MF_SKIP_THUMBNAIL"] = "1"
+        try:
+            result = export_3mf(
+                str(self.temp_file),
+                thumbnail_mode="CUSTOM",
+                thumbnail_image=img.name,
+            )
+        finally:
+            del os.environ["BLENDER_3MF_SKIP_THUMBNAIL"]
+        self.assertEqual(result.status, "FINISHED")
+        self.assertFalse(_has_thumbnail(str(self.temp_file)))
+
     def test_api_custom_file_path(self):
         """API: CUSTOM mode with an actual file path (backwards compat)."""
         bpy.ops.mesh.primitive_cube_add()
@@ -0,0 +1,40 @@
+"""
+Unit tests for ``io_mesh_3mf.export_3mf.archive``.
+
+Tests the compression choice for files written into the 3MF archive.
+"""
+
+import os
+import unittest
+import zipfile
+
+from io_mesh_3mf.export_3mf.archive import compress_type_for
+
+
+class TestCompressTypeFor(unittest.TestCase):
+    """compress_type_for() stores already-compressed payloads."""
+
+    def test_png_is_stored(self):
+        self.assertEqual(compress_type_for(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16), zipfile.ZIP_STORED)
+
+    def test_jpeg_is_stored(self):
+        self.assertEqual(compress_type_for(b"\xff\xd8\xff\xe0" + b"\x00" * 16), zipfile.ZIP_STORED)
+
+    def test_zip_is_stored(self):
+        self.assertEqual(compress_type_for(b"PK\x03\x04" + b"\x00" * 16), zipfile.ZIP_STORED)
+
+    def test_xml_is_deflated(self):
+        self.assertEqual(compress_type_for(b'<?xml version="1.0"?><model/>'), zipfile.ZIP_DEFLATED)
+
+    def test_random_bytes_are_stored(self):
+        self.assertEqual(compress_type_for(os.urandom(8192)), zipfile.ZIP_STORED)
+
+    def test_repetitive_binary_is_deflated(self):
+        self.assertEqual(compress_type_for(b"\x00\x01\x02\x03" * 2048), zipfile.ZIP_DEFLATED)
+
+    def test_empty_is_deflated(self):
+        self.assertEqual(compress_type_for(b""), zipfile.ZIP_DEFLATED)
+
+
+if __name__ == "__main__":
+    unittest.main()
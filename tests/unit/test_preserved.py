@@ -0,0 +1,43 @@
+"""
+Unit tests for ``io_mesh_3mf.common.preserved``.
+
+Tests the text encoding of MustPreserve files stored in Blender Text blocks.
+"""
+
+import base64
+import unittest
+
+from io_mesh_3mf.common.preserved import (
+    PRESERVED_BASE64_MARKER,
+    decode_preserved,
+    encode_preserved,
+)
+
+
+class TestPreservedEncoding(unittest.TestCase):
+    """encode_preserved() / decode_preserved() round-trip."""
+
+    def test_round_trip(self):
+        data = bytes(range(256)) * 4
+        self.assertEqual(decode_preserved(encode_preserved(data)), data)
+
+    def test_empty(self):
+        self.assertEqual(decode_preserved(encode_preserved(b"")), b"")
+
+    def test_marker(self):
+        self.assertTrue(encode_preserved(b"ticket").startswith(PRESERVED_BASE64_MARKER))
+
+    def test_legacy_base85(self):
+        """Text blocks written by older versions hold unmarked Base85."""
+        data = b"<PrintTicket/>\x00\xff"
+        legacy = base64.b85encode(data).decode("UTF-8")
+        self.assertEqual(decode_preserved(legacy), data)
+
+    def test_invalid_legacy_contents(self):
+        """Unmarked text that isn't Base85 raises ValueError, which the importer treats as a conflict."""
+        with self.assertRaises(ValueError):
+            decode_preserved('<?xml version="1.0"?>')
+
+
+if __name__ == "__main__":
+    unittest.main()